@@ -0,0 +1,261 @@
+# --- External libraries ---
+import argparse
+import json
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+# --- Internal libraries ---
+from engine import StackOutcome
+from history import ACTIONS, OUTCOMES, HandRecord, HistoryReader
+from intcards import hand_value, HARD_POINTS
+from player import PlayerActions
+
+
+# --- Constants ---
+CURVE_POINTS = 1024  # Maximum number of points kept in a bankroll curve
+NET_BINS = (-8.0, 8.0, 32)  # Histogram of the net result of a hand, in initial bets
+
+
+# --- Functions ---
+def up_value(code: int) -> int:
+    """Return the value of a dealer up card code, 11 for an ace"""
+    return 11 if HARD_POINTS[code] == 1 else HARD_POINTS[code]
+
+def analyze_file(path: str) -> "HandAnalytics":
+    """Return the aggregates of a history file"""
+    with HistoryReader(path) as reader:
+        return HandAnalytics().add_history(reader)
+
+def analyze_files(paths: list[str], workerNbr: int | None = None) -> "HandAnalytics":
+    """Aggregate several history files in parallel, merged in the order of the paths"""
+    if workerNbr == 1 or len(paths) < 2:
+        return reduce(HandAnalytics.merge, map(analyze_file, paths), HandAnalytics())
+    with ProcessPoolExecutor(workerNbr) as executor:
+        return reduce(HandAnalytics.merge, executor.map(analyze_file, paths), HandAnalytics())
+
+
+# --- Classes ---
+class RunningStats:
+    """Mean and variance of a stream of values (Welford), mergeable with other streams (Chan)"""
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.mean: float = 0.0
+        self.m2: float = 0.0  # Sum of the squared differences from the mean
+        self.minimum: float = float("inf")
+        self.maximum: float = float("-inf")
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def standardError(self) -> float:
+        """Return the standard error of the mean"""
+        return (self.variance / self.count) ** 0.5 if self.count else 0.0
+
+    def add(self, value: float) -> None:
+        """Add one value"""
+        self.count += 1
+        delta: float = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Add the values of another stream to this one"""
+        if other.count == 0:
+            return self
+        count: int = self.count + other.count
+        delta: float = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def as_dict(self) -> dict:
+        """Return the statistics as a dict"""
+        return {"count": self.count, "mean": self.mean, "variance": self.variance,
+                "min": self.minimum if self.count else None, "max": self.maximum if self.count else None}
+
+
+class Histogram:
+    """Counts of values in fixed bins, with the values out of range counted apart"""
+    def __init__(self, low: float, high: float, binNbr: int) -> None:
+        if binNbr < 1 or high <= low:
+            raise ValueError("a histogram needs at least one bin and low < high")
+        self.low: float = low
+        self.high: float = high
+        self.counts: list[int] = [0] * binNbr
+        self.underflow: int = 0
+        self.overflow: int = 0
+
+    def add(self, value: float) -> None:
+        """Count one value"""
+        if value < self.low:
+            self.underflow += 1
+        elif value >= self.high:
+            self.overflow += 1
+        else:
+            self.counts[int((value - self.low) / (self.high - self.low) * len(self.counts))] += 1
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        """Add the counts of a histogram with the same bins"""
+        if (other.low, other.high, len(other.counts)) != (self.low, self.high, len(self.counts)):
+            raise ValueError("histograms must have the same bins to be merged")
+        self.counts = [count + otherCount for count, otherCount in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def as_dict(self) -> dict:
+        """Return the histogram as a dict"""
+        return {"low": self.low, "high": self.high, "counts": list(self.counts),
+                "underflow": self.underflow, "overflow": self.overflow}
+
+
+class BankrollCurve:
+    """Cumulative net result sampled every step rounds, the step doubles when the curve gets too long"""
+    def __init__(self, maxPoints: int = CURVE_POINTS) -> None:
+        if maxPoints < 2:
+            raise ValueError("maxPoints must be at least 2")
+        self.maxPoints: int = maxPoints
+        self.step: int = 1
+        self.roundNbr: int = 0
+        self.bankroll: float = 0.0
+        self.points: list[tuple[int, float]] = []  # (rounds played, bankroll)
+
+    def add(self, net: float) -> None:
+        """Add the net result of one round"""
+        self.bankroll += net
+        self.roundNbr += 1
+        if self.roundNbr % self.step == 0:
+            self.points.append((self.roundNbr, self.bankroll))
+            if len(self.points) > self.maxPoints:
+                self.decimate()
+
+    def decimate(self) -> None:
+        """Keep one point out of two"""
+        self.points = self.points[1::2]
+        self.step *= 2
+
+    def merge(self, other: "BankrollCurve") -> "BankrollCurve":
+        """Append the rounds of another curve, played after the ones of this curve"""
+        self.points += [(self.roundNbr + roundNbr, self.bankroll + bankroll) for roundNbr, bankroll in other.points]
+        self.roundNbr += other.roundNbr
+        self.bankroll += other.bankroll
+        self.step = max(self.step, other.step)
+        while len(self.points) > self.maxPoints:
+            self.decimate()
+        return self
+
+    def as_dict(self) -> dict:
+        """Return the curve as a dict"""
+        return {"step": self.step, "rounds": self.roundNbr, "bankroll": self.bankroll,
+                "points": [list(point) for point in self.points]}
+
+
+class HandAnalytics:
+    """Aggregates of recorded rounds in constant memory, mergeable with the aggregates of other histories"""
+    def __init__(self) -> None:
+        self.roundNbr: int = 0
+        self.outcomeCounts: list[int] = [0] * len(OUTCOMES)
+        self.stackNet = RunningStats()  # Net of each stack, in initial bets
+        self.handNet = RunningStats()   # Net of each seat (all its stacks), in initial bets
+        self.netHistogram = Histogram(*NET_BINS)
+        # Net of a hand by (two cards value, dealer up card value, first action)
+        self.decisions: dict[tuple[int, int, PlayerActions], RunningStats] = {}
+        self.bankroll = BankrollCurve()
+
+    def add_round(self, records: list[HandRecord]) -> None:
+        """Add the records of one round (the dealer record is the last)"""
+        upValue: int = up_value(records[-1].cards[0])
+        seats: dict[int, list[HandRecord]] = {}
+        for record in records[:-1]:
+            seats.setdefault(record.seat, []).append(record)
+            self.outcomeCounts[record.outcome] += 1
+
+        roundNet: float = 0
+        for stacks in seats.values():
+            first: HandRecord = next(record for record in stacks if record.stack == 0)
+            actions: list[PlayerActions] = first.playerActions
+            # The bet placed before any double, the split stacks copied it
+            bet: int = first.bet // 2 if PlayerActions.DOUBLE in actions else first.bet
+            if bet <= 0:
+                continue
+            net: float = sum(record.amount for record in stacks) / bet
+            for record in stacks:
+                self.stackNet.add(record.amount / bet)
+            self.handNet.add(net)
+            self.netHistogram.add(net)
+            roundNet += sum(record.amount for record in stacks)
+            if actions:
+                # After a split the first stack lost its second card, which was the same as the first one
+                cards = first.cards[:1] * 2 if actions[0] is PlayerActions.SPLIT else first.cards[:2]
+                key = (hand_value(cards), upValue, actions[0])
+                if key not in self.decisions:
+                    self.decisions[key] = RunningStats()
+                self.decisions[key].add(net)
+        self.bankroll.add(roundNet)
+        self.roundNbr += 1
+
+    def add_history(self, reader: HistoryReader) -> "HandAnalytics":
+        """Add every round of a history"""
+        for records in reader.rounds():
+            self.add_round(records)
+        return self
+
+    def merge(self, other: "HandAnalytics") -> "HandAnalytics":
+        """Add the aggregates of another history, its rounds are played after these ones"""
+        self.roundNbr += other.roundNbr
+        self.outcomeCounts = [count + otherCount for count, otherCount in zip(self.outcomeCounts, other.outcomeCounts)]
+        self.stackNet.merge(other.stackNet)
+        self.handNet.merge(other.handNet)
+        self.netHistogram.merge(other.netHistogram)
+        for key, stats in other.decisions.items():
+            self.decisions.setdefault(key, RunningStats()).merge(stats)
+        self.bankroll.merge(other.bankroll)
+        return self
+
+    @property
+    def rates(self) -> dict[StackOutcome, float]:
+        """Return the share of the stacks ending with each outcome"""
+        stackNbr: int = sum(self.outcomeCounts)
+        return {outcome: count / stackNbr if stackNbr else 0.0 for outcome, count in zip(OUTCOMES, self.outcomeCounts)}
+
+    def as_dict(self) -> dict:
+        """Return every aggregate as a dict"""
+        return {
+            "rounds": self.roundNbr,
+            "rates": {outcome.value: rate for outcome, rate in self.rates.items()},
+            "stack_net": self.stackNet.as_dict(),
+            "hand_net": self.handNet.as_dict(),
+            "net_histogram": self.netHistogram.as_dict(),
+            "decisions": [{"value": value, "up": upValue, "action": action.value, **stats.as_dict()}
+                          for (value, upValue, action), stats in sorted(self.decisions.items(),
+                                                                        key=lambda item: (item[0][0], item[0][1], ACTIONS.index(item[0][2])))],
+            "bankroll": self.bankroll.as_dict(),
+        }
+
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate hand history files")
+    parser.add_argument("paths", nargs="+", help="history files written by history.HistoryWriter")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", help="JSON file receiving the aggregates, printed if omitted")
+    args = parser.parse_args()
+
+    report = analyze_files(args.paths, args.workers).as_dict()
+    if args.output is None:
+        print(json.dumps(report, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
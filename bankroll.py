@@ -0,0 +1,181 @@
+# --- External libraries ---
+import argparse
+import json
+from typing import Callable
+
+import numpy as np
+
+# --- Internal libraries ---
+from batch import BatchSimulator, mimic_dealer_table
+
+
+# --- Constants ---
+# A bet policy gets the bankrolls, the last bets and the last net results (in money, 0 before
+# the first hand) of the running sessions and returns their next bets
+BetPolicy = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+LENGTH_BINS = 20
+
+
+# --- Classes ---
+class FlatBet:
+    """Always bet the same amount"""
+    def __init__(self, unit: float) -> None:
+        self.unit: float = unit
+
+    def __call__(self, bankrolls: np.ndarray, lastBets: np.ndarray, lastNets: np.ndarray) -> np.ndarray:
+        return np.full(len(bankrolls), self.unit, dtype=np.float64)
+
+
+class ProportionalBet:
+    """Bet a fixed fraction of the bankroll"""
+    def __init__(self, fraction: float) -> None:
+        if not 0 < fraction <= 1:
+            raise ValueError("fraction must be between 0 and 1")
+        self.fraction: float = fraction
+
+    def __call__(self, bankrolls: np.ndarray, lastBets: np.ndarray, lastNets: np.ndarray) -> np.ndarray:
+        return np.floor(bankrolls * self.fraction)
+
+
+class Martingale:
+    """Double the bet after a loss, back to one unit after a win or a push"""
+    def __init__(self, unit: float, maxBet: float = float("inf")) -> None:
+        self.unit: float = unit
+        self.maxBet: float = maxBet
+
+    def __call__(self, bankrolls: np.ndarray, lastBets: np.ndarray, lastNets: np.ndarray) -> np.ndarray:
+        return np.where(lastNets < 0, np.minimum(lastBets * 2, self.maxBet), self.unit)
+
+
+class SessionReport:
+    """Final state of every simulated session"""
+    def __init__(self, startMoney: float, bankrolls: np.ndarray, lengths: np.ndarray, maxDrawdowns: np.ndarray,
+                 ruined: np.ndarray, stoppedWin: np.ndarray, stoppedLoss: np.ndarray) -> None:
+        self.startMoney: float = startMoney
+        self.bankrolls: np.ndarray = bankrolls
+        self.lengths: np.ndarray = lengths
+        self.maxDrawdowns: np.ndarray = maxDrawdowns
+        self.ruined: np.ndarray = ruined
+        self.stoppedWin: np.ndarray = stoppedWin
+        self.stoppedLoss: np.ndarray = stoppedLoss
+
+    @property
+    def riskOfRuin(self) -> float:
+        """Return the share of the sessions that could not pay the table minimum anymore"""
+        return float(self.ruined.mean())
+
+    def as_dict(self) -> dict:
+        """Return the summary of the sessions as a dict"""
+        lengthCounts, lengthEdges = np.histogram(self.lengths, bins=LENGTH_BINS)
+        return {
+            "sessions": len(self.bankrolls),
+            "risk_of_ruin": self.riskOfRuin,
+            "stop_win_rate": float(self.stoppedWin.mean()),
+            "stop_loss_rate": float(self.stoppedLoss.mean()),
+            "mean_final_bankroll": float(self.bankrolls.mean()),
+            "session_length": {
+                "mean": float(self.lengths.mean()),
+                "quantiles": {str(q): float(value) for q, value in zip(QUANTILES, np.quantile(self.lengths, QUANTILES))},
+                "histogram": {"edges": lengthEdges.tolist(), "counts": lengthCounts.tolist()},
+            },
+            "max_drawdown_quantiles": {str(q): float(value)
+                                       for q, value in zip(QUANTILES, np.quantile(self.maxDrawdowns, QUANTILES))},
+        }
+
+
+class BankrollSimulator:
+    """Play many bankroll sessions at once, each one on its own shoe, one hand per session in lockstep"""
+    def __init__(self, table: np.ndarray | None = None, deckNbr: int = 6, penetration: float = 0.75,
+                 rng: np.random.Generator | None = None) -> None:
+        self.batch = BatchSimulator(mimic_dealer_table() if table is None else table, deckNbr, penetration, rng)
+
+    def simulate(self, sessionNbr: int, startMoney: float, policy: BetPolicy, minBet: float = 1,
+                 maxBet: float = float("inf"), stopLoss: float | None = None, stopWin: float | None = None,
+                 maxHands: int = 10_000) -> SessionReport:
+        """Play every session until it is ruined, reaches a stop limit or plays maxHands hands.
+
+        A session is ruined when its bankroll can't pay the table minimum, stopLoss and stopWin
+        are amounts lost or won since the start of the session. A hand doubles only when the
+        bankroll covers twice its bet, otherwise the table plays it without doubling.
+        """
+        if minBet <= 0 or maxBet < minBet:
+            raise ValueError("the table limits must satisfy 0 < minBet <= maxBet")
+        # Both stops trigger once the limit is reached, the ruin under the table minimum
+        lossLimit: float = float("-inf") if stopLoss is None else startMoney - stopLoss
+        highLimit: float = float("inf") if stopWin is None else startMoney + stopWin
+
+        batch = self.batch
+        shoes = batch.new_shoes(sessionNbr)
+        positions = np.zeros(sessionNbr, dtype=np.int64)
+        bankrolls = np.full(sessionNbr, startMoney, dtype=np.float64)
+        peaks = bankrolls.copy()
+        maxDrawdowns = np.zeros(sessionNbr)
+        lengths = np.zeros(sessionNbr, dtype=np.int64)
+        lastBets = np.zeros(sessionNbr)
+        lastNets = np.zeros(sessionNbr)
+
+        rows = np.flatnonzero(bankrolls >= minBet)
+        for _ in range(maxHands):
+            rows = rows[(bankrolls[rows] >= minBet) & (bankrolls[rows] > lossLimit) & (bankrolls[rows] < highLimit)]
+            if len(rows) == 0:
+                break
+            # The bet is kept between the table limits and what the session can pay, and a hand
+            # only doubles if the session can pay twice the bet, so a bankroll never goes negative
+            bets = np.clip(policy(bankrolls[rows], lastBets[rows], lastNets[rows]), minBet, maxBet)
+            bets = np.minimum(bets, bankrolls[rows])
+            nets = batch.play_round(shoes, positions, rows, bankrolls[rows] >= 2 * bets)[0] * bets
+
+            bankrolls[rows] += nets
+            lengths[rows] += 1
+            lastBets[rows] = bets
+            lastNets[rows] = nets
+            peaks[rows] = np.maximum(peaks[rows], bankrolls[rows])
+            maxDrawdowns[rows] = np.maximum(maxDrawdowns[rows], peaks[rows] - bankrolls[rows])
+
+            # New shoes for the sessions that reached their cut card
+            finished = rows[batch.shoeLength - positions[rows] <= batch.cutCard]
+            if len(finished) > 0:
+                shoes[finished] = batch.new_shoes(len(finished))
+                positions[finished] = 0
+
+        ruined = bankrolls < minBet
+        stoppedWin = bankrolls >= highLimit
+        stoppedLoss = ~ruined & (bankrolls <= lossLimit)
+        return SessionReport(startMoney, bankrolls, lengths, maxDrawdowns, ruined, stoppedWin, stoppedLoss)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate many bankroll sessions and report the risk of ruin")
+    parser.add_argument("--sessions", type=int, default=10_000)
+    parser.add_argument("--money", type=float, default=1000, help="bankroll at the start of a session")
+    parser.add_argument("--bet", type=float, default=10, help="unit bet")
+    parser.add_argument("--policy", choices=("flat", "proportional", "martingale"), default="flat")
+    parser.add_argument("--fraction", type=float, default=0.02, help="bankroll fraction of the proportional policy")
+    parser.add_argument("--min-bet", type=float, default=10)
+    parser.add_argument("--max-bet", type=float, default=float("inf"))
+    parser.add_argument("--stop-loss", type=float)
+    parser.add_argument("--stop-win", type=float)
+    parser.add_argument("--hands", type=int, default=10_000, help="maximum number of hands per session")
+    parser.add_argument("--table", help="strategy table saved by solver.save_table, plays like the dealer if omitted")
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    table = None
+    if args.table is not None:
+        from solver import load_table
+        table = load_table(args.table)
+    policies: dict[str, BetPolicy] = {
+        "flat": FlatBet(args.bet),
+        "proportional": ProportionalBet(args.fraction),
+        "martingale": Martingale(args.bet, args.max_bet),
+    }
+    simulator = BankrollSimulator(table, args.decks, rng=np.random.default_rng(args.seed))
+    report = simulator.simulate(args.sessions, args.money, policies[args.policy], args.min_bet, args.max_bet,
+                                args.stop_loss, args.stop_win, args.hands)
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
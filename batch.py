@@ -0,0 +1,145 @@
+# --- External libraries ---
+import numpy as np
+
+# --- Internal libraries ---
+from engine import StackOutcome
+from hand_state import BLACKJACK_VALUE, DEALER_STAND_VALUE, EMPTY_STATE, POINT_ROW, TRANSITIONS, VALUES, IS_SOFT, DEALER_HITS
+from intcards import CARD_NBR, HARD_POINTS
+from player import PlayerActions
+
+
+# --- Constants ---
+# Strategy table: table[handKind, handValue, dealerUpValue] is the code of the action to play.
+# The PAIR rows are indexed by the value of one card of the pair, they are optional since the
+# batch simulator does not split. DOUBLE is "double, otherwise hit" and DOUBLE_STAND
+# "double, otherwise stand", the otherwise being played when doubling is not allowed.
+HARD, SOFT, PAIR = 0, 1, 2
+STAND, HIT, DOUBLE, SPLIT, DOUBLE_STAND = 0, 1, 2, 3, 4
+TABLE_ACTIONS: tuple[PlayerActions, ...] = (PlayerActions.STAND, PlayerActions.HIT, PlayerActions.DOUBLE,
+                                            PlayerActions.SPLIT, PlayerActions.DOUBLE)
+NO_DOUBLE_CODES: tuple[int, ...] = (STAND, HIT, HIT, SPLIT, STAND)  # Code played instead when doubling is not allowed
+TABLE_SHAPE = (2, BLACKJACK_VALUE + 1, 12)
+
+# Outcome codes returned by the simulator, index in this tuple
+OUTCOMES: tuple[StackOutcome, ...] = tuple(StackOutcome)
+WIN, LOSS, PUSH, BLACKJACK, BUST = (OUTCOMES.index(outcome) for outcome in (
+    StackOutcome.WIN, StackOutcome.LOSS, StackOutcome.PUSH, StackOutcome.BLACKJACK, StackOutcome.BUST))
+
+POINTS = np.frombuffer(HARD_POINTS, dtype=np.uint8).astype(np.intp)
+# Hand state tables (see hand_state) as arrays: STATE_TRANSITIONS[state, points] is the next state
+STATE_TRANSITIONS = np.array(TRANSITIONS, dtype=np.intp).reshape(-1, POINT_ROW)
+STATE_VALUES = np.array(VALUES, dtype=np.intp)
+STATE_SOFT = np.array(IS_SOFT, dtype=np.intp)
+STATE_DEALER_HITS = np.array(DEALER_HITS, dtype=bool)
+NO_DOUBLE = np.array(NO_DOUBLE_CODES, dtype=np.uint8)
+
+
+# --- Functions ---
+def mimic_dealer_table() -> np.ndarray:
+    """Return a strategy table that plays like the dealer (hit under 17, never double)"""
+    table = np.full(TABLE_SHAPE, STAND, dtype=np.uint8)
+    table[:, :DEALER_STAND_VALUE, :] = HIT
+    return table
+
+
+# --- Classes ---
+class BatchSimulator:
+    """Play one seat against the dealer on many shoes at once, one round per shoe in lockstep"""
+    def __init__(self, table: np.ndarray, deckNbr: int = 6, penetration: float = 0.75,
+                 rng: np.random.Generator | None = None) -> None:
+        if table.ndim != 3 or table.shape[0] < 2 or table.shape[1:] != TABLE_SHAPE[1:]:
+            raise ValueError(f"table must have the shape {TABLE_SHAPE}")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be between 0 and 1")
+        self.table: np.ndarray = table
+        self.deckNbr: int = deckNbr
+        self.shoeLength: int = deckNbr * CARD_NBR
+        self.cutCard: int = self.shoeLength - int(self.shoeLength * penetration)
+        self.rng: np.random.Generator = rng if rng is not None else np.random.default_rng()
+
+    def new_shoes(self, shoeNbr: int) -> np.ndarray:
+        """Return shoeNbr shuffled shoes, one per row"""
+        shoe = np.tile(np.arange(CARD_NBR, dtype=np.uint8), self.deckNbr)
+        return self.rng.permuted(np.broadcast_to(shoe, (shoeNbr, self.shoeLength)), axis=1)
+
+    def play_round(self, shoes: np.ndarray, positions: np.ndarray, rows: np.ndarray,
+                   canDouble: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """Play one round on the given rows of the shoes, return the net results and outcome codes.
+
+        canDouble optionally tells for each row whether the hand may double (for example if the
+        bankroll can pay it), the table fallback is played otherwise.
+        """
+        def draw(selection: np.ndarray) -> np.ndarray:
+            shoeRows = rows[selection]
+            # A round running past the end of a shoe wraps to its start (only with a penetration close to 1)
+            codes = shoes[shoeRows, positions[shoeRows] % self.shoeLength]
+            positions[shoeRows] += 1
+            return POINTS[codes]
+
+        everyRow = np.arange(len(rows))
+        playerStates = STATE_TRANSITIONS[EMPTY_STATE, draw(everyRow)]
+        upPoints = draw(everyRow)
+        dealerStates = STATE_TRANSITIONS[EMPTY_STATE, upPoints]
+        playerStates = STATE_TRANSITIONS[playerStates, draw(everyRow)]
+        dealerStates = STATE_TRANSITIONS[dealerStates, draw(everyRow)]
+
+        upValues = np.where(upPoints == 1, 11, upPoints)
+        bets = np.ones(len(rows), dtype=np.int16)
+        cardNbrs = np.full(len(rows), 2, dtype=np.int16)
+
+        # Player turn, every hand still under 21 asks the strategy table
+        playing = STATE_VALUES[playerStates] < BLACKJACK_VALUE
+        while playing.any():
+            hands = np.flatnonzero(playing)
+            states = playerStates[hands]
+            actions = self.table[STATE_SOFT[states], STATE_VALUES[states], upValues[hands]]
+            # Doubling is only allowed on the two first cards, otherwise its fallback is played
+            doubleAllowed = cardNbrs[hands] == 2
+            if canDouble is not None:
+                doubleAllowed &= canDouble[hands]
+            actions = np.where(doubleAllowed, actions, NO_DOUBLE[actions])
+            doubling = (actions == DOUBLE) | (actions == DOUBLE_STAND)
+            hitting = actions != STAND
+            playing[hands[~hitting]] = False
+
+            hands = hands[hitting]
+            playerStates[hands] = STATE_TRANSITIONS[playerStates[hands], draw(hands)]
+            cardNbrs[hands] += 1
+            bets[hands[doubling[hitting]]] = 2
+            playing[hands[doubling[hitting]]] = False
+            playing &= STATE_VALUES[playerStates] < BLACKJACK_VALUE
+        playerValues = STATE_VALUES[playerStates]
+
+        # Dealer turn, only against hands that still have to be compared
+        hitting = (playerValues < BLACKJACK_VALUE) & STATE_DEALER_HITS[dealerStates]
+        while hitting.any():
+            hands = np.flatnonzero(hitting)
+            dealerStates[hands] = STATE_TRANSITIONS[dealerStates[hands], draw(hands)]
+            hitting &= STATE_DEALER_HITS[dealerStates]
+        dealerValues = STATE_VALUES[dealerStates]
+
+        # Settlement, with the same rules as RoundEngine.settle_stack
+        outcomes = np.select(
+            [playerValues > BLACKJACK_VALUE,
+             playerValues == BLACKJACK_VALUE,
+             (dealerValues > BLACKJACK_VALUE) | (playerValues > dealerValues),
+             playerValues < dealerValues],
+            [BUST, BLACKJACK, WIN, LOSS], PUSH).astype(np.uint8)
+        nets = np.select(
+            [outcomes == BUST, outcomes == BLACKJACK, outcomes == WIN, outcomes == LOSS],
+            [-bets, np.where(cardNbrs == 2, 1.5, 1.0) * bets, bets, -bets], 0.0)
+        return nets, outcomes
+
+    def simulate(self, shoeNbr: int) -> tuple[np.ndarray, np.ndarray]:
+        """Play shoeNbr shoes until their cut card, return the net result and outcome code of every round"""
+        shoes = self.new_shoes(shoeNbr)
+        positions = np.zeros(shoeNbr, dtype=np.int64)
+        nets: list[np.ndarray] = []
+        outcomes: list[np.ndarray] = []
+        rows = np.arange(shoeNbr)
+        while len(rows) > 0:
+            roundNets, roundOutcomes = self.play_round(shoes, positions, rows)
+            nets.append(roundNets)
+            outcomes.append(roundOutcomes)
+            rows = rows[self.shoeLength - positions[rows] > self.cutCard]
+        return np.concatenate(nets), np.concatenate(outcomes)
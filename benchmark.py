@@ -0,0 +1,135 @@
+# --- External libraries ---
+import argparse
+import json
+import os
+import platform
+import subprocess
+from random import Random
+from time import perf_counter
+from typing import Callable
+
+# --- Internal libraries ---
+from card import Card, CardValues, CardSuits
+from engine import RoundEngine, mimic_dealer
+from intcards import IntShoe, IntStack, from_card
+from shoe import Shoe
+from stack import Stack
+
+
+# --- Constants ---
+DECK_NBRS = (1, 6)
+PLAYER_NBRS = range(1, 8)
+SESSION_MONEY = 10 ** 12  # Enough for the players to never run out during a session
+
+
+# --- Functions ---
+def measure(func: Callable[[], object], number: int, repeat: int = 5,
+            setup: Callable[[], object] | None = None) -> float:
+    """Return the best time per call of func over repeat runs of number calls"""
+    best: float = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start: float = perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (perf_counter() - start) / number)
+    return best
+
+def new_engine(playerNbr: int, deckNbr: int, seed: int) -> RoundEngine:
+    """Return a headless engine with rich players playing like the dealer"""
+    engine = RoundEngine(playerNbr, mimic_dealer, lambda player: 1, deckNbr, rng=Random(seed))
+    for player in engine.players:
+        player.totalMoney = SESSION_MONEY
+    return engine
+
+def bench_deck(deckNbr: int, seed: int) -> list[dict]:
+    """Time the deck operations of a shoe, and of the integer shoe for comparison"""
+    shoe = Shoe(deckNbr, rng=Random(seed))
+    intShoe = IntShoe(deckNbr, rng=Random(seed))
+    return [
+        {"name": "Deck.generate", "decks": deckNbr, "seconds": measure(lambda: shoe.generate(deckNbr), 200)},
+        {"name": "Deck.shuffle", "decks": deckNbr, "seconds": measure(shoe.shuffle, 200)},
+        {"name": "Deck.pick_card", "decks": deckNbr, "seconds": measure(shoe.pick_card, len(shoe), setup=shoe.shuffle)},
+        {"name": "IntShoe.reshuffle", "decks": deckNbr, "seconds": measure(intShoe.reshuffle, 200)},
+        {"name": "IntShoe.pick_card", "decks": deckNbr,
+         "seconds": measure(intShoe.pick_card, len(intShoe), setup=intShoe.reshuffle)},
+    ]
+
+def bench_stack() -> list[dict]:
+    """Time the scoring of a stack, and of the same hands as integer stacks"""
+    stack = Stack(1)
+    for value in (CardValues.ACE, CardValues.SIX, CardValues.FOUR):
+        stack.append(Card(value, CardSuits.HEARTS))
+    pair = Stack(1)
+    for suit in (CardSuits.HEARTS, CardSuits.CLUBS):
+        pair.append(Card(CardValues.EIGHT, suit))
+    intStack = IntStack(from_card(card) for card in stack)
+    intPair = IntStack(from_card(card) for card in pair)
+    return [
+        {"name": "Stack.value", "seconds": measure(lambda: stack.value, 100_000)},
+        {"name": "Stack.is_splitable", "seconds": measure(pair.is_splitable, 100_000)},
+        {"name": "IntStack.value", "seconds": measure(lambda: intStack.value, 100_000)},
+        {"name": "IntStack.is_splitable", "seconds": measure(intPair.is_splitable, 100_000)},
+    ]
+
+def bench_round(playerNbr: int, deckNbr: int, seed: int, roundNbr: int) -> dict:
+    """Time a full headless round"""
+    engine = new_engine(playerNbr, deckNbr, seed)
+    return {"name": "RoundEngine.play_round", "decks": deckNbr, "players": playerNbr,
+            "seconds": measure(engine.play_round, roundNbr)}
+
+def bench_session(playerNbr: int, deckNbr: int, seed: int, roundNbr: int) -> dict:
+    """Time a whole session of headless rounds, seconds is the time per round"""
+    engine = new_engine(playerNbr, deckNbr, seed)
+    start: float = perf_counter()
+    for _ in range(roundNbr):
+        engine.play_round()
+    totalSeconds: float = perf_counter() - start
+    return {"name": "session", "decks": deckNbr, "players": playerNbr, "rounds": roundNbr,
+            "seconds": totalSeconds / roundNbr, "total_seconds": totalSeconds}
+
+def git_commit() -> str | None:
+    """Return the current commit hash, None outside of a git repository"""
+    try:
+        # Run from the directory of the benchmark, whatever the working directory of the caller
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(seed: int, roundNbr: int, sessionRounds: int) -> dict:
+    """Run every benchmark and return the report"""
+    results: list[dict] = bench_stack()
+    for deckNbr in DECK_NBRS:
+        results += bench_deck(deckNbr, seed)
+        for playerNbr in PLAYER_NBRS:
+            results.append(bench_round(playerNbr, deckNbr, seed, roundNbr))
+    if sessionRounds > 0:
+        results.append(bench_session(1, max(DECK_NBRS), seed, sessionRounds))
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the card, deck, stack and round hot paths")
+    parser.add_argument("--output", default="benchmark.json", help="JSON file receiving the results")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rounds", type=int, default=2000, help="rounds timed per table size")
+    parser.add_argument("--session-rounds", type=int, default=10 ** 6, help="rounds of the session benchmark, 0 to skip it")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.seed, args.rounds, args.session_rounds)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    for result in report["results"]:
+        labels = " ".join(f"{key}={result[key]}" for key in ("decks", "players", "rounds") if key in result)
+        print(f"{result['name']:<24} {labels:<28} {result['seconds'] * 1e6:>14.3f} us")
+
+
+if __name__ == "__main__":
+    main()
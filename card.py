@@ -1,6 +1,6 @@
 # --- External libraries ---
 from enum import Enum, IntEnum
-from termcolor import colored
+from functools import lru_cache
 
 
 # --- Constants ---
@@ -25,43 +25,70 @@ class CardSuits(Enum):
     CLUBS = "♣"
     SPADES = "♠"
 
+# The 13 ranks from TWO (0) to ACE (12), the members are iterated to keep the aliases (JACK, QUEEN and KING are worth TEN)
+RANK_VALUES: tuple[CardValues, ...] = tuple(CardValues.__members__.values())
+RANK_NAMES: tuple[str, ...] = tuple(CardValues.__members__)
+SUIT_INDEXES: dict[CardSuits, int] = {suit: index for index, suit in enumerate(CardSuits)}
+
+
+# --- Functions ---
+@lru_cache(maxsize=None)
+def colored_text(text: str, color: str) -> str:
+    """Return a colored text, termcolor is only imported by the first call (headless runs never need it)"""
+    from termcolor import colored
+    return colored(text, color)
+
+def hidden_card_display() -> str:
+    """Return how a face down card is displayed"""
+    return colored_text("??", "grey")
+
 
 # --- Classes ---
 class Card:
+    """A playing card, there is only one instance of each of the 52 cards and it can't be modified.
+
+    Whether a card is face down or colored depends on the hand showing it (see Stack).
+    """
     SUITS_COLORS = {
         CardSuits.HEARTS: "red",
         CardSuits.DIAMONDS: "red",
         CardSuits.CLUBS: "blue",
         CardSuits.SPADES: "blue"
     }
-
-    def __init__(self, value: CardValues, suit: CardSuits) -> None:
-        self.base_value: int = value.value
-        self.suit: CardSuits = suit
-        self.hidden: bool = False
-        self.colored: bool = True
+    __slots__ = ("base_value", "rank", "suit", "code", "text")
+    _instances: dict[tuple[int, CardSuits], "Card"] = {}
+
+    def __new__(cls, value: CardValues, suit: CardSuits, rank: int | None = None) -> "Card":
+        # Without a rank, the figures are built as tens
+        rank = RANK_VALUES.index(value) if rank is None else rank
+        card: Card | None = cls._instances.get((rank, suit))
+        if card is None:
+            card = object.__new__(cls)
+            for name, attributeValue in (("base_value", RANK_VALUES[rank].value), ("rank", rank), ("suit", suit),
+                                         ("code", rank << 2 | SUIT_INDEXES[suit]), ("text", f"{RANK_VALUES[rank].value} {suit.value}")):
+                object.__setattr__(card, name, attributeValue)
+            cls._instances[(rank, suit)] = card
+        return card
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("cards can't be modified")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("cards can't be modified")
+
+    def __reduce__(self):
+        # Unpickled cards are the same instances
+        return Card, (RANK_VALUES[self.rank], self.suit, self.rank)
 
     @property
     def value(self) -> int:
-        """Return the value of the card depending on its current state"""
-        return 0 if self.hidden else self.base_value
+        """Return the value of the card (11 for an ace)"""
+        return self.base_value
 
     @property
     def display(self) -> str:
-        """Return a string representation of the card dynamically"""
-        if self.hidden:
-            return colored("??", "grey")
-        if self.colored:
-            return colored(f"{self.base_value} {self.suit.value}", self.SUITS_COLORS[self.suit])
-        return f"{self.base_value} {self.suit.value}"
-
-    def hide(self) -> None:
-        """Hide the card"""
-        self.hidden = True
-
-    def reveal(self) -> None:
-        """Reveal the card"""
-        self.hidden = False
+        """Return the colored representation of the card, computed once"""
+        return colored_text(self.text, self.SUITS_COLORS[self.suit])
 
     def __str__(self) -> str:
         return self.display
@@ -69,18 +96,19 @@ class Card:
     def __repr__(self) -> str:
         return self.display
 
-    # --- Comparisons between cards---
+    # --- Comparisons between cards, by rank (the equality is the identity) ---
     def __lt__(self, other) -> bool:
-        return isinstance(other, Card) and self.value < other.value
+        return isinstance(other, Card) and self.rank < other.rank
 
     def __le__(self, other) -> bool:
-        return isinstance(other, Card) and self.value <= other.value
-
-    def __eq__(self, other) -> bool:
-        return isinstance(other, Card) and self.value == other.value
+        return isinstance(other, Card) and self.rank <= other.rank
 
     def __ge__(self, other) -> bool:
-        return isinstance(other, Card) and self.value >= other.value
+        return isinstance(other, Card) and self.rank >= other.rank
 
     def __gt__(self, other) -> bool:
-        return isinstance(other, Card) and self.value > other.value
+        return isinstance(other, Card) and self.rank > other.rank
+
+
+# The 52 cards in the order of a new deck, suit by suit
+DECK_CARDS: tuple[Card, ...] = tuple(Card(value, suit, rank) for suit in CardSuits for rank, value in enumerate(RANK_VALUES))
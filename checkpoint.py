@@ -0,0 +1,125 @@
+# --- External libraries ---
+import os
+import struct
+from random import Random
+
+# --- Internal libraries ---
+from engine import RoundEngine, StackOutcome
+from intcards import from_card, to_card
+
+
+# --- Constants ---
+MAGIC = b"BJCK"
+VERSION = 1
+# Binary layout, little endian:
+#   HEADER              magic, version, rounds played, decks, penetration, cut card, position,
+#                       reshuffles, card number, counter flag, running count, player number, summary flag
+#   cards               one intcards code per card of the shoe, in shoe order
+#   RNG                 Random.getstate(): version, 625 words (624 of state and the index), gauss flag and value
+#   player money        one int64 per player
+#   SUMMARY (optional)  stacks, net total, net squares, then OUTCOME_COUNTS counts
+HEADER = struct.Struct("<4sHQHdIIIIBqHB")
+RNG_STATE = struct.Struct("<B625IBd")
+MONEY = struct.Struct("<q")
+OUTCOME_NBR = len(StackOutcome)
+SUMMARY = struct.Struct(f"<Qdd{OUTCOME_NBR}Q")
+
+
+# --- Functions ---
+def encode_rng(rng: Random) -> bytes:
+    """Return the state of a Random as bytes"""
+    version, words, gauss = rng.getstate()
+    return RNG_STATE.pack(version, *words, gauss is not None, gauss or 0.0)
+
+def decode_rng(rng: Random, data: bytes) -> None:
+    """Restore the state of a Random saved by encode_rng"""
+    fields = RNG_STATE.unpack(data)
+    rng.setstate((fields[0], fields[1:626], fields[627] if fields[626] else None))
+
+def encode_checkpoint(engine: RoundEngine, roundNbr: int, summary=None) -> bytes:
+    """Return the snapshot of an engine between two rounds.
+
+    summary is an optional parallel.SimulationSummary accumulated by the run. The decision and
+    bet callbacks are not saved, they must not keep their own random state (a strategy can
+    draw from the RNG of the shoe, which is saved).
+    """
+    deck = engine.deck
+    counter = deck.counter
+    parts: list[bytes] = [
+        HEADER.pack(MAGIC, VERSION, roundNbr, deck.deckNbr, deck.penetration, deck.cutCard, deck.position,
+                    deck.reshuffleNbr, len(deck), counter is not None, counter.runningCount if counter else 0,
+                    len(engine.players), summary is not None),
+        bytes(from_card(card) for card in deck),
+        encode_rng(deck.rng),
+    ]
+    parts += [MONEY.pack(player.totalMoney) for player in engine.players]
+    if summary is not None:
+        parts.append(SUMMARY.pack(summary.stackNbr, summary.netTotal, summary.netSquares, *summary.outcomeCounts))
+    return b"".join(parts)
+
+def decode_checkpoint(data: bytes, engine: RoundEngine, summary=None) -> int:
+    """Restore a snapshot into an engine built with the same table, return the number of rounds played"""
+    (magic, version, roundNbr, deckNbr, penetration, cutCard, position, reshuffleNbr, cardNbr,
+     hasCounter, runningCount, playerNbr, hasSummary) = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a checkpoint of this version")
+    if playerNbr != len(engine.players):
+        raise ValueError(f"the checkpoint has {playerNbr} players, the engine {len(engine.players)}")
+    offset: int = HEADER.size
+
+    deck = engine.deck
+    deck[:] = [to_card(code) for code in data[offset:offset + cardNbr]]
+    offset += cardNbr
+    deck.deckNbr, deck.penetration, deck.cutCard = deckNbr, penetration, cutCard
+    deck.position, deck.reshuffleNbr = position, reshuffleNbr
+    if hasCounter and deck.counter is not None:
+        deck.counter.runningCount = runningCount
+    decode_rng(deck.rng, data[offset:offset + RNG_STATE.size])
+    offset += RNG_STATE.size
+
+    for player in engine.players:
+        player.totalMoney = MONEY.unpack_from(data, offset)[0]
+        player.reset_stacks()
+        offset += MONEY.size
+    engine.dealer.reset_stacks()
+
+    if hasSummary and summary is not None:
+        stackNbr, netTotal, netSquares, *outcomeCounts = SUMMARY.unpack_from(data, offset)
+        summary.stackNbr, summary.netTotal, summary.netSquares = stackNbr, netTotal, netSquares
+        summary.outcomeCounts = outcomeCounts
+    return roundNbr
+
+def save_checkpoint(path: str, engine: RoundEngine, roundNbr: int, summary=None) -> None:
+    """Write the snapshot of an engine to a file, replacing it atomically"""
+    temporaryPath: str = f"{path}.tmp"
+    with open(temporaryPath, "wb") as file:
+        file.write(encode_checkpoint(engine, roundNbr, summary))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporaryPath, path)
+
+def load_checkpoint(path: str, engine: RoundEngine, summary=None) -> int:
+    """Restore the snapshot of a file into an engine, return the number of rounds played"""
+    with open(path, "rb") as file:
+        return decode_checkpoint(file.read(), engine, summary)
+
+
+# --- Classes ---
+class Checkpointer:
+    """Save an engine every `every` rounds, and resume it from the last save if there is one"""
+    def __init__(self, path: str, every: int = 10_000) -> None:
+        if every < 1:
+            raise ValueError("every must be greater than 0")
+        self.path: str = path
+        self.every: int = every
+
+    def resume(self, engine: RoundEngine, summary=None) -> int:
+        """Restore the last snapshot, return the number of rounds already played (0 without a snapshot)"""
+        if not os.path.exists(self.path):
+            return 0
+        return load_checkpoint(self.path, engine, summary)
+
+    def end_round(self, engine: RoundEngine, roundNbr: int, summary=None) -> None:
+        """Save the engine if roundNbr rounds played is a multiple of every"""
+        if roundNbr % self.every == 0:
+            save_checkpoint(self.path, engine, roundNbr, summary)
@@ -0,0 +1,80 @@
+# --- External libraries ---
+from math import floor
+
+# --- Internal libraries ---
+from card import Card
+from deck import Deck
+from player import Player
+
+
+# --- Constants ---
+# Tag of each card value (11 for an ace) in the counting systems
+HI_LO: dict[int, int] = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 0, 8: 0, 9: 0, 10: -1, 11: -1}
+KO: dict[int, int] = {2: 1, 3: 1, 4: 1, 5: 1, 6: 1, 7: 1, 8: 0, 9: 0, 10: -1, 11: -1}
+OMEGA_II: dict[int, int] = {2: 1, 3: 1, 4: 2, 5: 2, 6: 2, 7: 1, 8: 0, 9: -1, 10: -2, 11: 0}
+DECK_SIZE = 52
+MIN_DECKS_LEFT = 0.25  # Avoid huge true counts at the very end of a shoe
+
+
+# --- Classes ---
+class CardCounter:
+    """Running and true count of a deck, updated by the deck every time a card is drawn.
+
+    The counter attaches itself to the deck, replacing the counter it had.
+    """
+    def __init__(self, deck: Deck, system: dict[int, int] = HI_LO) -> None:
+        self.deck: Deck = deck
+        self.tags: tuple[int, ...] = tuple(system.get(value, 0) for value in range(12))
+        self.runningCount: int = 0
+        self.hiddenNbr: int = 0  # Cards out of the deck but not seen yet (the dealer hole card)
+        deck.counter = self
+
+    @property
+    def decksLeft(self) -> float:
+        """Return the number of decks of unseen cards, the ones left to draw and the face down ones"""
+        return max((self.deck.remaining + self.hiddenNbr) / DECK_SIZE, MIN_DECKS_LEFT)
+
+    @property
+    def trueCount(self) -> float:
+        """Return the running count per deck left"""
+        return self.runningCount / self.decksLeft
+
+    def observe(self, card: Card) -> None:
+        """Count a card leaving the deck"""
+        self.runningCount += self.tags[card.base_value]
+
+    def hide(self, card: Card) -> None:
+        """Uncount a card that left the deck face down (the dealer hole card)"""
+        self.runningCount -= self.tags[card.base_value]
+        self.hiddenNbr += 1
+
+    def reveal(self, card: Card) -> None:
+        """Count a face down card once it is revealed"""
+        self.runningCount += self.tags[card.base_value]
+        self.hiddenNbr = max(self.hiddenNbr - 1, 0)  # The deck may have been reshuffled since it was hidden
+
+    def reset(self) -> None:
+        """Restart the count, when the deck is shuffled"""
+        self.runningCount = 0
+        self.hiddenNbr = 0
+
+
+class BetSpread:
+    """Bet callback sizing the bet from the true count"""
+    def __init__(self, counter: CardCounter, unit: int, spread: dict[int, int]) -> None:
+        if not spread:
+            raise ValueError("spread must map at least one true count to a number of units")
+        self.counter: CardCounter = counter
+        self.minCount: int = min(spread)
+        maxCount: int = max(spread)
+        # Units for every true count from minCount to maxCount, a missing count keeps the units of the previous one
+        self.bets: list[int] = []
+        units: int = spread[self.minCount]
+        for trueCount in range(self.minCount, maxCount + 1):
+            units = spread.get(trueCount, units)
+            self.bets.append(unit * units)
+
+    def __call__(self, player: Player) -> int:
+        index: int = floor(self.counter.trueCount) - self.minCount
+        bet: int = self.bets[min(max(index, 0), len(self.bets) - 1)]
+        return min(bet, player.totalMoney)
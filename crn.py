@@ -0,0 +1,182 @@
+# --- External libraries ---
+import argparse
+import json
+from random import Random
+
+# --- Internal libraries ---
+from analytics import RunningStats
+from card import Card
+from engine import RoundEngine, RoundResult, BetCallback, player_decision
+from player import Player
+from strategy import Strategy, parse_strategy
+
+
+# --- Constants ---
+CONFIDENCE_Z = 1.96  # 95% confidence interval
+PAIRED_MONEY = 10 ** 12  # Enough for the players to never run out
+
+
+# --- Functions ---
+def round_seed(seed: int, roundIndex: int) -> str:
+    """Return the seed of the shoe of a round, the same for every strategy"""
+    return f"{seed}:{roundIndex}"
+
+
+# --- Classes ---
+class PairedEngine(RoundEngine):
+    """RoundEngine dealing from shoes shuffled from a seed, one round or one whole shoe per seed.
+
+    In a seeded round, the players draw from the top of the shoe and the dealer hits from the
+    bottom, so the dealer cards of a round do not depend on how many cards the players took.
+    The count is always close to 0 on a fresh shoe: strategies using a counting.CardCounter
+    must be compared on whole shoes, where every card is drawn from the top and counted.
+    A counter is attached with CardCounter(engine.deck) before building the strategy and the
+    bet callback (set to engine.bet) that use it.
+    """
+    def __init__(self, strategy: Strategy, deckNbr: int = 6, bet: int = 2) -> None:
+        super().__init__(1, player_decision, lambda player: bet, deckNbr, rng=Random())
+        self.players[0].strategy = strategy
+        self.dealerPosition: int = len(self.deck)
+        self.dealerFromBottom: bool = True
+
+    def pick_card(self, player: Player, stackIndex: int = 0) -> Card:
+        if player is not self.dealer or not self.dealerFromBottom:
+            return super().pick_card(player, stackIndex)
+        self.dealerPosition -= 1
+        card: Card = self.deck[self.dealerPosition]
+        self.give_card(player, card, stackIndex)
+        return card
+
+    def shuffle_seeded(self, seed: str) -> None:
+        """Shuffle the shoe from a seed"""
+        # Back to the order of a new shoe, so that the same seed always gives the same shuffle
+        self.deck.generate(self.deck.deckNbr)
+        self.deck.rng.seed(seed)
+        self.deck.reshuffle()
+        self.dealerPosition = len(self.deck)
+
+    def play_seeded_round(self, seed: str) -> list[RoundResult]:
+        """Play a round on the shoe given by the seed"""
+        self.players[0].totalMoney = PAIRED_MONEY
+        self.dealerFromBottom = True
+        self.shuffle_seeded(seed)
+        return self.play_round()
+
+    def play_seeded_shoe(self, seed: str) -> tuple[int, int]:
+        """Play rounds on the shoe given by the seed until its cut card, return the net amount and the number of rounds"""
+        self.dealerFromBottom = False
+        self.shuffle_seeded(seed)
+        amount: int = 0
+        roundNbr: int = 0
+        while not self.deck.needsShuffle:
+            self.players[0].totalMoney = PAIRED_MONEY
+            amount += sum(roundAmount for _, _, _, roundAmount in self.play_round())
+            roundNbr += 1
+        return amount, roundNbr
+
+
+class PairedReport:
+    """Net results of each strategy and paired differences with the first one, in bets per round or per shoe"""
+    def __init__(self, names: list[str], unit: str = "round") -> None:
+        self.names: list[str] = names
+        self.unit: str = unit
+        self.nets: list[RunningStats] = [RunningStats() for _ in names]
+        self.differences: list[RunningStats] = [RunningStats() for _ in names[1:]]
+        self.roundNbrs: list[int] = [0] * len(names)  # Rounds played by each strategy
+
+    def add(self, nets: list[float], roundNbrs: list[int] | None = None) -> None:
+        """Add the net results of one round or shoe, one per strategy, with the rounds each one played"""
+        for stats, net in zip(self.nets, nets):
+            stats.add(net)
+        for stats, net in zip(self.differences, nets[1:]):
+            stats.add(net - nets[0])
+        self.roundNbrs = [total + roundNbr for total, roundNbr in zip(self.roundNbrs, roundNbrs or [1] * len(nets))]
+
+    def merge(self, other: "PairedReport") -> "PairedReport":
+        """Add the rounds or shoes of another report of the same strategies"""
+        for stats, otherStats in zip(self.nets + self.differences, other.nets + other.differences):
+            stats.merge(otherStats)
+        self.roundNbrs = [total + roundNbr for total, roundNbr in zip(self.roundNbrs, other.roundNbrs)]
+        return self
+
+    def as_dict(self) -> dict:
+        """Return the EV of every strategy and the paired differences with their confidence interval"""
+        baseline: RunningStats = self.nets[0]
+        report: dict = {
+            f"{self.unit}s": baseline.count,
+            "strategies": {name: {"ev": stats.mean, "ci": CONFIDENCE_Z * stats.standardError,
+                                  "ev_per_round": stats.mean * stats.count / roundNbr if roundNbr else 0.0}
+                           for name, stats, roundNbr in zip(self.names, self.nets, self.roundNbrs)},
+            "differences": {},
+        }
+        for name, stats, nets in zip(self.names[1:], self.differences, self.nets[1:]):
+            # Variance of the difference of two independent samples of the same size, to show the gain
+            independentVariance: float = baseline.variance + nets.variance
+            report["differences"][f"{name} - {self.names[0]}"] = {
+                "ev": stats.mean,
+                "ci": CONFIDENCE_Z * stats.standardError,
+                "variance_reduction": independentVariance / stats.variance if stats.variance else None,
+            }
+        return report
+
+
+class PairedComparison:
+    """Play several strategies on the same shoes, round by round or shoe by shoe, to compare them with common random numbers.
+
+    A strategy can be given as a ready PairedEngine, to attach a counter to its shoe (see PairedEngine).
+    Only playing decisions and bets are compared, every engine plays the same rules: rule variants
+    (surrender allowed or not, split rules...) can't be compared since the engine has no options for them.
+    """
+    def __init__(self, strategies: dict[str, Strategy | PairedEngine], deckNbr: int = 6, bet: int = 2) -> None:
+        if len(strategies) < 2:
+            raise ValueError("at least two strategies are needed to compare them")
+        self.names: list[str] = list(strategies)
+        self.engines: list[PairedEngine] = [strategy if isinstance(strategy, PairedEngine)
+                                            else PairedEngine(strategy, deckNbr, bet)
+                                            for strategy in strategies.values()]
+        self.bet: int = bet
+
+    def run(self, roundNbr: int, seed: int = 0, firstRound: int = 0) -> PairedReport:
+        """Play rounds firstRound to firstRound + roundNbr with every strategy"""
+        report = PairedReport(self.names)
+        for roundIndex in range(firstRound, firstRound + roundNbr):
+            shoeSeed: str = round_seed(seed, roundIndex)
+            report.add([sum(amount for _, _, _, amount in engine.play_seeded_round(shoeSeed)) / self.bet
+                        for engine in self.engines])
+        return report
+
+    def run_shoes(self, shoeNbr: int, seed: int = 0, firstShoe: int = 0) -> PairedReport:
+        """Play shoes firstShoe to firstShoe + shoeNbr with every strategy, each one until the cut card.
+
+        The strategies are synced at the end of every shoe: they see the same cards in the same
+        order, and a count keeps its meaning through the shoe.
+        """
+        report = PairedReport(self.names, "shoe")
+        for shoeIndex in range(firstShoe, firstShoe + shoeNbr):
+            shoeSeed: str = round_seed(seed, shoeIndex)
+            results: list[tuple[int, int]] = [engine.play_seeded_shoe(shoeSeed) for engine in self.engines]
+            report.add([amount / self.bet for amount, _ in results], [roundNbr for _, roundNbr in results])
+        return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare strategies on the same shoes (common random numbers)",
+                                     epilog="Every strategy plays the same table rules, rule variants such as "
+                                            "surrender or split rules can't be compared.")
+    parser.add_argument("strategies", nargs="+", help="mimic, random or table:<path>, the first one is the baseline")
+    parser.add_argument("--rounds", type=int, default=100_000)
+    parser.add_argument("--shoes", type=int, help="pair whole shoes instead of rounds, for count based strategies")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--decks", type=int, default=6)
+    args = parser.parse_args()
+
+    comparison = PairedComparison({name: parse_strategy(name) for name in args.strategies}, args.decks)
+    if args.shoes is not None:
+        report = comparison.run_shoes(args.shoes, args.seed)
+    else:
+        report = comparison.run(args.rounds, args.seed)
+    print(json.dumps(report.as_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
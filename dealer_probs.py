@@ -0,0 +1,55 @@
+# --- External libraries ---
+from functools import lru_cache
+
+# --- Internal libraries ---
+from hand_state import BLACKJACK_VALUE, DEALER_STAND_VALUE
+
+
+# --- Constants ---
+# A shoe composition is the number of cards left for each hard point value: (aces, twos, ..., tens)
+POINT_NBR = 10
+FINAL_TOTALS: tuple[int, ...] = tuple(range(DEALER_STAND_VALUE, BLACKJACK_VALUE + 1))
+BUST = len(FINAL_TOTALS)  # Index of the bust probability in a distribution
+DEALER_CACHE_SIZE = 1 << 18
+
+
+# --- Functions ---
+def shoe_composition(deckNbr: int) -> tuple[int, ...]:
+    """Return the composition of a full shoe of deckNbr decks"""
+    return (4 * deckNbr,) * (POINT_NBR - 1) + (16 * deckNbr,)
+
+def remove_card(counts: tuple[int, ...], points: int) -> tuple[int, ...]:
+    """Return a composition without one card of the given hard points (1 for an ace)"""
+    index: int = points - 1
+    if counts[index] < 1:
+        raise ValueError(f"no card worth {points} left in the composition")
+    return counts[:index] + (counts[index] - 1,) + counts[index + 1:]
+
+@lru_cache(maxsize=DEALER_CACHE_SIZE)
+def dealer_outcomes(hardTotal: int, hasAce: bool, counts: tuple[int, ...]) -> tuple[float, ...]:
+    """Return the probabilities of each final total then bust, for a dealer hand and the cards left"""
+    value: int = hardTotal + 10 if hasAce and hardTotal <= 11 else hardTotal
+    if value > BLACKJACK_VALUE:
+        return (0.0,) * BUST + (1.0,)
+    if value >= DEALER_STAND_VALUE:
+        return tuple(1.0 if total == value else 0.0 for total in FINAL_TOTALS) + (0.0,)
+
+    distribution: list[float] = [0.0] * (BUST + 1)
+    cardNbr: int = sum(counts)  # An empty shoe leaves the probabilities at 0
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        probability: float = count / cardNbr
+        nextCounts = counts[:index] + (count - 1,) + counts[index + 1:]
+        for outcome, outcomeProbability in enumerate(dealer_outcomes(hardTotal + index + 1, hasAce or index == 0, nextCounts)):
+            distribution[outcome] += probability * outcomeProbability
+    return tuple(distribution)
+
+def dealer_distribution(upValue: int, counts: tuple[int, ...]) -> tuple[float, ...]:
+    """Return the exact distribution of the dealer final total (17 to 21, then bust).
+
+    upValue is the value of the dealer's visible card (11 for an ace) and counts the
+    composition of the cards left, without the up card. The hole card is drawn from it.
+    """
+    hardPoints: int = 1 if upValue == 11 else upValue
+    return dealer_outcomes(hardPoints, hardPoints == 1, tuple(counts))
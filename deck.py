@@ -1,39 +1,67 @@
 # --- External libraries ---
-from random import shuffle
+from random import Random
 
 # --- Internal libraries ---
-from card import Card, CardValues, CardSuits
+from card import Card, DECK_CARDS
 
 
 # --- Classes ---
 class Deck(list):
-    def __init__(self):
+    def __init__(self, rng: Random | None = None):
         super().__init__()
+        self.rng: Random = rng if rng is not None else Random()
+        self.position: int = 0  # Index of the next card to draw, the cards before it are out of the deck
+        self.counter = None  # Optional counting.CardCounter told about every card leaving the deck
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of cards left in the deck"""
+        return len(self) - self.position
     
-    def generate(self):
-        """Generate a deck of 52 cards """
-        self.clear()
-        for suit in CardSuits:
-            for value in CardValues:
-                self.append(Card(value, suit))
+    def generate(self, deckNbr: int = 1):
+        """Generate deckNbr decks of 52 cards"""
+        # The cards are shared singletons, only the references are copied
+        self[:] = DECK_CARDS * deckNbr
+        self.position = 0
 
     def shuffle(self):
-        """Shuffle the deck"""
-        shuffle(self)
+        """Put every card back in the deck and shuffle it"""
+        self.rng.shuffle(self)
+        self.position = 0
+        if self.counter is not None:
+            self.counter.reset()
+
+    def card_position(self, card_index: int) -> int:
+        """Return the position in the list of the card_index-th card from the top"""
+        if card_index <= 0:
+            raise ValueError("card_index must be greater than 0")
+        return self.position + (card_index - 1) % self.remaining
         
     def choose_card(self, card_index: int) -> Card | None:
         """Choose a card from the deck"""
-        if len(self) < 1:
+        if self.remaining < 1:
             return None
-        if card_index <= 0:
-            raise ValueError("card_index must be greater than 0")
-        for i in range(card_index):
-            card : Card = self[i % len(self)]
-            if card:
-                return card
-        return None
+        return self[self.card_position(card_index)]
     
-    def pick_card(self, card_index: int) -> Card | None:
+    def pick_card(self, card_index: int = 1) -> Card | None:
         """Pick a card and remove it from the deck"""
-        card = self.choose_card(card_index)
-        return self.pop(self.index(card))
+        if self.remaining < 1:
+            return None
+        cardPosition: int = self.card_position(card_index)
+        card: Card = self[cardPosition]
+        # Swap the card with the top of the deck, then move the top past it
+        self[cardPosition] = self[self.position]
+        self[self.position] = card
+        self.position += 1
+        if self.counter is not None:
+            self.counter.observe(card)
+        return card
+
+    def draw(self, cardNbr: int) -> list[Card]:
+        """Pick cardNbr cards from the top of the deck (less if the deck runs out)"""
+        cards: list[Card] = self[self.position:self.position + cardNbr]
+        self.position += len(cards)
+        if self.counter is not None:
+            for card in cards:
+                self.counter.observe(card)
+        return cards
@@ -0,0 +1,229 @@
+# --- External libraries ---
+from enum import Enum
+from random import Random
+from typing import Callable
+
+# --- Internal libraries ---
+from card import Card
+from hand_state import BLACKJACK_VALUE
+from instrumentation import Instrumentation, timed
+from player import Player, PlayerActions
+from shoe import Shoe
+
+
+# --- Constants ---
+class StackOutcome(Enum):
+    WIN = "win"               # Beat the dealer
+    LOSS = "loss"             # Lost against the dealer
+    PUSH = "push"             # Same total as the dealer
+    BLACKJACK = "blackjack"   # Reached 21 (paid 3:2 with two cards)
+    BUST = "bust"             # Exceeded 21
+    SURRENDER = "surrender"   # Gave up half of the bet
+
+DecisionCallback = Callable[[Player, int, Card], PlayerActions | None]
+BetCallback = Callable[[Player], int]
+RoundResult = tuple[Player, int, StackOutcome, int]
+
+
+# --- Functions ---
+def mimic_dealer(player: Player, stackIndex: int, upCard: Card) -> PlayerActions:
+    """Decision callback playing like the dealer: hit under 17"""
+    return PlayerActions.HIT if player.stacks[stackIndex].dealerHits else PlayerActions.STAND
+
+def player_decision(player: Player, stackIndex: int, upCard: Card) -> PlayerActions | None:
+    """Decision callback letting the player choose, with its strategy or by asking it"""
+    return player.choose_action(stackIndex, upCard)
+
+
+# --- Classes ---
+class RoundEngine:
+    """Blackjack rules without terminal I/O, decisions and bets come from callbacks"""
+    def __init__(self, player_nbr: int, decide: DecisionCallback, bet: BetCallback,
+                 deckNbr: int = 1, penetration: float = 0.75, rng: Random | None = None,
+                 instrumentation: Instrumentation | None = None) -> None:
+        self.players = [Player(i+1) for i in range(player_nbr)]
+        self.dealer = Player('Dealer')
+        self.deck = Shoe(deckNbr, penetration, rng)
+        self.decide: DecisionCallback = decide
+        self.bet: BetCallback = bet
+        self.instrumentation: Instrumentation | None = instrumentation
+        self.history = None  # Optional history.HistoryWriter recording every round
+
+    @property
+    def seatedPlayers(self) -> list[Player]:
+        """Return the players who placed a bet this round"""
+        return [player for player in self.players if player.stacks]
+
+    @property
+    def upCard(self) -> Card:
+        """Return the visible card of the dealer"""
+        return self.dealer.stacks[0][0]
+
+    @property
+    def holeCard(self) -> Card:
+        """Return the hidden card of the dealer"""
+        return self.dealer.stacks[0][1]
+
+    @timed
+    def prepare_round(self) -> None:
+        """Clear the previous round and reshuffle the shoe once the cut card is reached"""
+        self.dealer.reset_stacks()
+        for player in self.players:
+            player.reset_stacks()
+        if self.deck.needsShuffle:
+            self.deck.reshuffle()
+
+    @timed
+    def place_bets(self) -> None:
+        """Ask a bet to every player who still has money"""
+        for player in self.players:
+            if player.totalMoney > 0:
+                player.set_initial_stack(self.bet(player))
+
+    def give_card(self, player: Player, card: Card, stackIndex: int = 0) -> None:
+        """Add a card to a stack of a player"""
+        player.stacks[stackIndex].append(card)
+        if self.history is not None:
+            self.history.give_card(player, stackIndex)
+        if self.instrumentation is not None:
+            self.instrumentation.count("cards_drawn")
+
+    def pick_card(self, player: Player, stackIndex: int = 0) -> Card:
+        """Pick a card from the deck and add it to a stack of a player"""
+        card: Card = self.deck.pick_card()
+        self.give_card(player, card, stackIndex)
+        return card
+
+    @timed
+    def deal_starting_cards(self) -> None:
+        """Deal two cards to each seated player and the dealer"""
+        self.dealer.set_initial_stack(0)
+        receivers: list[Player] = self.seatedPlayers + [self.dealer]
+        # One draw for the whole table, dealt one card at a time around the table
+        cards: list[Card] = self.deck.draw(2 * len(receivers))
+        if self.history is not None:
+            self.history.begin_round(self.players, self.dealer, self.deck.position - len(cards))
+        for cardIndex, card in enumerate(cards):
+            self.give_card(receivers[cardIndex % len(receivers)], card)
+
+        self.dealer.stacks[0].hide_card(1)
+        if self.deck.counter is not None:
+            self.deck.counter.hide(self.holeCard)
+
+    def is_stack_playing(self, player: Player, stackIndex: int) -> bool:
+        """Return True if the stack still needs a decision, end it on 21 or bust"""
+        stack = player.stacks[stackIndex]
+        if stack.isPlaying and stack.value >= BLACKJACK_VALUE:
+            stack.kill()
+        return stack.isPlaying
+
+    def apply_action(self, player: Player, stackIndex: int, action: PlayerActions) -> None:
+        """Apply the action chosen by a player on one of its stacks"""
+        if self.instrumentation is not None and action is not None:
+            self.instrumentation.count_action(action)
+        if self.history is not None and action is not None:
+            self.history.record_action(player, stackIndex, action)
+        match action:
+            case PlayerActions.HIT:
+                self.pick_card(player, stackIndex)
+
+            case PlayerActions.STAND:
+                player.stacks[stackIndex].end()
+
+            case PlayerActions.DOUBLE:
+                self.pick_card(player, stackIndex)
+                player.stacks[stackIndex].bet *= 2
+                player.stacks[stackIndex].end()
+
+            case PlayerActions.SPLIT:
+                newIndex: int = player.split(stackIndex)
+                self.pick_card(player, stackIndex)
+                self.pick_card(player, newIndex)
+
+            case PlayerActions.SURRENDER:
+                player.stacks[stackIndex].surrender()
+
+            case _:
+                raise ValueError("Invalid action")
+
+    @timed
+    def player_turn(self, player: Player) -> None:
+        """Play every stack of a player, including the ones created by a split"""
+        stackIndex = 0
+        while stackIndex < len(player.stacks):
+            while self.is_stack_playing(player, stackIndex):
+                self.apply_action(player, stackIndex, self.decide(player, stackIndex, self.upCard))
+            stackIndex += 1
+
+    def needs_dealer(self) -> bool:
+        """Return True if at least one stack has to be compared with the dealer"""
+        return any(stack.isAlive and not stack.isSurrendered
+                   for player in self.seatedPlayers
+                   for stack in player.stacks.values())
+
+    @timed
+    def dealer_turn(self, onUpdate: Callable[[], None] | None = None) -> None:
+        """Reveal the hidden card and hit until the dealer reaches 17"""
+        self.dealer.stacks[0].reveal_cards()
+        if self.deck.counter is not None:
+            self.deck.counter.reveal(self.holeCard)
+        if not self.needs_dealer():
+            return
+        if onUpdate is not None:
+            onUpdate()
+        dealerStack = self.dealer.stacks[0]
+        while dealerStack.dealerHits:
+            self.pick_card(self.dealer)
+            if onUpdate is not None:
+                onUpdate()
+
+    def settle_stack(self, player: Player, stackIndex: int) -> RoundResult:
+        """Compute the outcome of a stack and pay it"""
+        stack = player.stacks[stackIndex]
+        dealerTotal: int = self.dealer.stacks[0].value
+        playerTotal: int = stack.value
+
+        if stack.isSurrendered:
+            outcome, amount = StackOutcome.SURRENDER, -(stack.bet // 2)
+        elif playerTotal > BLACKJACK_VALUE:
+            outcome, amount = StackOutcome.BUST, -stack.bet
+        elif playerTotal == BLACKJACK_VALUE:
+            amount = stack.bet * 3 // 2 if stack.isBlackjack else stack.bet
+            outcome = StackOutcome.BLACKJACK
+        elif dealerTotal > BLACKJACK_VALUE or playerTotal > dealerTotal:
+            outcome, amount = StackOutcome.WIN, stack.bet
+        elif playerTotal < dealerTotal:
+            outcome, amount = StackOutcome.LOSS, -stack.bet
+        else:
+            outcome, amount = StackOutcome.PUSH, 0
+
+        player.totalMoney += amount
+        return player, stackIndex, outcome, amount
+
+    @timed
+    def compare_hands(self) -> list[RoundResult]:
+        """Settle every stack of the round against the dealer"""
+        results: list[RoundResult] = [self.settle_stack(player, stackIndex)
+                                      for player in self.seatedPlayers
+                                      for stackIndex in range(len(player.stacks))]
+        if self.history is not None:
+            self.history.write_round(results, self.dealer.stacks[0])
+        return results
+
+    def play_round(self) -> list[RoundResult]:
+        """Play a whole round and return the result of every stack"""
+        self.prepare_round()
+        self.place_bets()
+        self.deal_starting_cards()
+        for player in self.seatedPlayers:
+            self.player_turn(player)
+        self.dealer_turn()
+        results = self.compare_hands()
+        self.end_round()
+        return results
+
+    def end_round(self) -> None:
+        """Report the end of a round to the instrumentation"""
+        if self.instrumentation is not None:
+            self.instrumentation.counters["reshuffles"] = self.deck.reshuffleNbr
+            self.instrumentation.end_round()
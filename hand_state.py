@@ -0,0 +1,78 @@
+# --- Constants ---
+BLACKJACK_VALUE = 21
+DEALER_STAND_VALUE = 17  # The dealer hits while under this value
+ACE_POINTS = 1  # An ace is drawn as 1 point and counted as 11 while it does not bust
+SOFT_BONUS = 10
+POINT_ROW = 11  # Width of a row of the transition table, indexed by the points of the drawn card (1 to 10)
+MAX_CARD_NBR = 3  # Card numbers are only told apart up to 2 (blackjack, pair), above they share a state
+
+
+# --- Functions ---
+def state_key(hardTotal: int, hasAce: bool, cardNbr: int, firstPoints: int) -> tuple[int, bool, int, int]:
+    """Return the key of a hand state.
+
+    firstPoints is the points of the only card of a one card hand, or of one card of a pair,
+    0 otherwise: it is all that is needed to know if the two first cards are a pair.
+    """
+    return hardTotal, hasAce, min(cardNbr, MAX_CARD_NBR), firstPoints
+
+def next_key(key: tuple[int, bool, int, int], points: int) -> tuple[int, bool, int, int]:
+    """Return the key of the state reached by drawing a card of the given points"""
+    hardTotal, hasAce, cardNbr, firstPoints = key
+    if hardTotal > BLACKJACK_VALUE:  # A busted hand stays busted
+        return key
+    if cardNbr == 0:
+        firstPoints = points
+    elif cardNbr == 1 and firstPoints == points:
+        firstPoints = points
+    else:
+        firstPoints = 0
+    return state_key(hardTotal + points, hasAce or points == ACE_POINTS, cardNbr + 1, firstPoints)
+
+def build_states() -> tuple[list[tuple[int, bool, int, int]], list[int]]:
+    """Return every state reachable from an empty hand and the flat transition table"""
+    keys: list[tuple[int, bool, int, int]] = [state_key(0, False, 0, 0)]
+    indexes: dict[tuple[int, bool, int, int], int] = {keys[0]: 0}
+    transitions: list[int] = []
+    stateIndex = 0
+    while stateIndex < len(keys):  # keys grows while it is walked through
+        row: list[int] = [stateIndex] * POINT_ROW  # Index 0 is not a card, it keeps the state
+        for points in range(ACE_POINTS, POINT_ROW):
+            key = next_key(keys[stateIndex], points)
+            if key not in indexes:
+                indexes[key] = len(keys)
+                keys.append(key)
+            row[points] = indexes[key]
+        transitions += row
+        stateIndex += 1
+    return keys, transitions
+
+def state_value(key: tuple[int, bool, int, int]) -> int:
+    """Return the best value of a hand state"""
+    hardTotal, hasAce, _, _ = key
+    return hardTotal + SOFT_BONUS if hasAce and hardTotal + SOFT_BONUS <= BLACKJACK_VALUE else hardTotal
+
+def next_state(state: int, points: int) -> int:
+    """Return the state reached by drawing a card of the given points (1 for an ace)"""
+    return TRANSITIONS[state * POINT_ROW + points]
+
+def hand_state(pointsList) -> int:
+    """Return the state of a hand from the points of its cards"""
+    state: int = EMPTY_STATE
+    for points in pointsList:
+        state = TRANSITIONS[state * POINT_ROW + points]
+    return state
+
+
+# --- Tables ---
+STATE_KEYS, TRANSITIONS = build_states()
+EMPTY_STATE = 0
+STATE_NBR = len(STATE_KEYS)
+# Properties of every state, indexed by the state
+HARD_TOTALS: tuple[int, ...] = tuple(key[0] for key in STATE_KEYS)
+VALUES: tuple[int, ...] = tuple(state_value(key) for key in STATE_KEYS)
+IS_SOFT: tuple[bool, ...] = tuple(value != key[0] for key, value in zip(STATE_KEYS, VALUES))
+IS_BUST: tuple[bool, ...] = tuple(value > BLACKJACK_VALUE for value in VALUES)
+IS_BLACKJACK: tuple[bool, ...] = tuple(key[2] == 2 and value == BLACKJACK_VALUE for key, value in zip(STATE_KEYS, VALUES))
+DEALER_HITS: tuple[bool, ...] = tuple(value < DEALER_STAND_VALUE for value in VALUES)
+PAIR_POINTS: tuple[int, ...] = tuple(key[3] if key[2] == 2 else 0 for key in STATE_KEYS)  # 0 if not a pair
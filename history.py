@@ -0,0 +1,265 @@
+# --- External libraries ---
+import mmap
+import os
+import struct
+from typing import Iterator, NamedTuple
+
+# --- Internal libraries ---
+from card import Card
+from engine import RoundEngine, RoundResult, StackOutcome
+from intcards import from_card, to_card
+from player import Player, PlayerActions
+from stack import Stack
+
+
+# --- Constants ---
+# One fixed-width record per stack of a round, followed by one record for the dealer:
+#   round     uint64   index of the round in the file
+#   position  uint16   position of the shoe before the starting cards
+#   seat      uint8    index of the player in the table, DEALER_SEAT for the dealer
+#   stack     uint8    index of the stack
+#   bet       int32    bet of the stack (doubled bets included)
+#   amount    int32    money won (positive) or lost (negative)
+#   outcome   uint8    index in OUTCOMES, NO_OUTCOME for the dealer
+#   cardNbr   uint8    number of cards used in cards and draws
+#   cards     16 bytes intcards codes of the cards, in stack order
+#   draws     16 bytes index of each card in the draw order of the round
+#   actionNbr uint8    number of actions used in actions
+#   actions   16 bytes index in ACTIONS of every action played on the stack
+RECORD = struct.Struct("<QHBBiiBB16s16sB16s")
+MAX_STACK_CARDS = 16  # A stack can't hold more than 15 cards without reaching 21
+DEALER_SEAT = 0xFF
+NO_OUTCOME = 0xFF
+OUTCOMES: tuple[StackOutcome, ...] = tuple(StackOutcome)
+ACTIONS: tuple[PlayerActions, ...] = tuple(PlayerActions)
+ACTION_CODES: dict[PlayerActions, int] = {action: code for code, action in enumerate(ACTIONS)}
+OUTCOME_CODES: dict[StackOutcome, int] = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+DEFAULT_BUFFER_RECORDS = 8192
+REPLAY_MONEY = 10 ** 12  # Enough for the replayed players to never run out
+
+
+class HandRecord(NamedTuple):
+    round: int
+    position: int
+    seat: int
+    stack: int
+    bet: int
+    amount: int
+    outcome: int
+    cardNbr: int
+    cards: bytes
+    draws: bytes
+    actionNbr: int
+    actions: bytes
+
+    @property
+    def isDealer(self) -> bool:
+        """Return True if the record holds the cards of the dealer"""
+        return self.seat == DEALER_SEAT
+
+    @property
+    def stackOutcome(self) -> StackOutcome | None:
+        """Return the outcome of the stack, None for the dealer"""
+        return None if self.outcome == NO_OUTCOME else OUTCOMES[self.outcome]
+
+    @property
+    def cardCodes(self) -> bytes:
+        """Return the codes of the cards of the stack"""
+        return self.cards[:self.cardNbr]
+
+    @property
+    def playerActions(self) -> list[PlayerActions]:
+        """Return the actions played on the stack"""
+        return [ACTIONS[code] for code in self.actions[:self.actionNbr]]
+
+
+# --- Functions ---
+def replay_round(records: list[HandRecord]) -> tuple[RoundEngine, list[RoundResult]]:
+    """Play a recorded round again through the engine rules.
+
+    The shoe is loaded with the recorded cards in their draw order and every decision
+    is the recorded action, return the engine (to inspect the table) and the results.
+    """
+    draws: list[tuple[int, int]] = []
+    for record in records:
+        draws += zip(record.draws[:record.cardNbr], record.cardCodes)
+    seatRecords: dict[int, list[HandRecord]] = {}
+    for record in records:
+        if not record.isDealer:
+            seatRecords.setdefault(record.seat, []).append(record)
+    actions: dict[tuple[int, int], list[PlayerActions]] = {
+        (record.seat, record.stack): record.playerActions for record in records if not record.isDealer}
+
+    def bet(player: Player) -> int:
+        firstStack: HandRecord = next(record for record in seatRecords[seats[player]] if record.stack == 0)
+        # A doubled first stack recorded twice the initial bet (the split stacks copy it before)
+        return firstStack.bet // 2 if PlayerActions.DOUBLE in firstStack.playerActions else firstStack.bet
+
+    def decide(player: Player, stackIndex: int, upCard: Card) -> PlayerActions:
+        return actions[(seats[player], stackIndex)].pop(0)
+
+    engine = RoundEngine(max(seatRecords) + 1 if seatRecords else 0, decide, bet)
+    seats: dict[Player, int] = {player: seat for seat, player in enumerate(engine.players)}
+    for seat, player in enumerate(engine.players):
+        player.totalMoney = REPLAY_MONEY if seat in seatRecords else 0
+    engine.deck.clear()
+    engine.deck.extend(to_card(code) for _, code in sorted(draws))
+    engine.deck.position = 0
+    engine.deck.cutCard = 0
+    return engine, engine.play_round()
+
+
+# --- Classes ---
+class HistoryWriter:
+    """Append the hand history of an engine to a binary file, records are written by blocks"""
+    def __init__(self, path: str, bufferRecords: int = DEFAULT_BUFFER_RECORDS) -> None:
+        if bufferRecords < 1:
+            raise ValueError("bufferRecords must be greater than 0")
+        self.file = open(path, "ab")
+        # An interrupted write can leave a partial record or a round without its dealer record at the end,
+        # cut them so the appended rounds stay aligned and continue the numbering from the last whole round
+        lastRound, completeSize = self.last_round(path)
+        self.file.truncate(completeSize)
+        self.roundNbr: int = lastRound + 1
+        self.bufferSize: int = bufferRecords * RECORD.size
+        self.buffer = bytearray()
+        # Current round
+        self.position: int = 0
+        self.seats: dict[Player, int] = {}
+        self.draws: dict[tuple[int, int], list[int]] = {}
+        self.actions: dict[tuple[int, int], list[int]] = {}
+        self.drawNbr: int = 0
+
+    @staticmethod
+    def last_round(path: str) -> tuple[int, int]:
+        """Return the index of the last whole round of an existing history (-1 if there is none) and the size up to its end"""
+        with HistoryReader(path) as reader:
+            for index in range(len(reader) - 1, -1, -1):
+                record: HandRecord = reader[index]
+                if record.isDealer:  # The dealer record is the last one of a round
+                    return record.round, (index + 1) * RECORD.size
+        return -1, 0
+
+    def begin_round(self, players: list[Player], dealer: Player, position: int) -> None:
+        """Start recording a round, position is the one of the shoe before the starting cards"""
+        self.position = position
+        self.seats = {player: seat for seat, player in enumerate(players)}
+        self.seats[dealer] = DEALER_SEAT
+        self.draws = {}
+        self.actions = {}
+        self.drawNbr = 0
+
+    def give_card(self, player: Player, stackIndex: int) -> None:
+        """Record that the next card drawn went to a stack"""
+        self.draws.setdefault((self.seats[player], stackIndex), []).append(self.drawNbr)
+        self.drawNbr += 1
+
+    def record_action(self, player: Player, stackIndex: int, action: PlayerActions) -> None:
+        """Record an action, before the engine applies it"""
+        key: tuple[int, int] = (self.seats[player], stackIndex)
+        self.actions.setdefault(key, []).append(ACTION_CODES[action])
+        if action is PlayerActions.SPLIT:
+            # Follow Player.split: the second card moves to a new stack at the end
+            self.draws[(key[0], len(player.stacks))] = [self.draws[key].pop(1)]
+
+    def pack(self, seat: int, stackIndex: int, stack: Stack, outcome: int, amount: int) -> None:
+        """Add the record of a stack to the buffer"""
+        if len(stack) > MAX_STACK_CARDS:
+            raise ValueError(f"a stack can't hold more than {MAX_STACK_CARDS} cards in the history")
+        actions: list[int] = self.actions.get((seat, stackIndex), [])
+        self.buffer += RECORD.pack(self.roundNbr, self.position, seat, stackIndex, stack.bet, amount, outcome,
+                                   len(stack), bytes(from_card(card) for card in stack),
+                                   bytes(self.draws[(seat, stackIndex)]), len(actions), bytes(actions))
+
+    def write_round(self, results: list[RoundResult], dealerStack: Stack) -> None:
+        """Record the settled stacks of the round and the dealer cards"""
+        if self.drawNbr > 0xFF:
+            raise ValueError("a round can't draw more than 255 cards in the history")
+        for player, stackIndex, outcome, amount in results:
+            self.pack(self.seats[player], stackIndex, player.stacks[stackIndex], OUTCOME_CODES[outcome], amount)
+        self.pack(DEALER_SEAT, 0, dealerStack, NO_OUTCOME, 0)
+        self.roundNbr += 1
+        if len(self.buffer) >= self.bufferSize:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records to the file"""
+        self.file.write(self.buffer)
+        self.file.flush()
+        self.buffer.clear()
+
+    def close(self) -> None:
+        """Write the remaining records and close the file"""
+        self.flush()
+        self.file.close()
+
+    def __enter__(self) -> "HistoryWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HistoryReader:
+    """Memory-mapped view of a history file, the records are decoded on access"""
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "rb")
+        size: int = os.fstat(self.file.fileno()).st_size
+        # An empty file can't be mapped, a partial record at the end (interrupted write) is ignored
+        self.recordNbr: int = size // RECORD.size
+        self.map: mmap.mmap | None = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+    def __len__(self) -> int:
+        return self.recordNbr
+
+    def __getitem__(self, index: int) -> HandRecord:
+        if not 0 <= index < self.recordNbr:
+            raise IndexError("record index out of range")
+        return HandRecord(*RECORD.unpack_from(self.map, index * RECORD.size))
+
+    def __iter__(self) -> Iterator[HandRecord]:
+        if self.map is None:
+            return
+        view = memoryview(self.map)[:self.recordNbr * RECORD.size]
+        try:
+            for fields in RECORD.iter_unpack(view):
+                yield HandRecord(*fields)
+        finally:
+            view.release()
+
+    def rounds(self) -> Iterator[list[HandRecord]]:
+        """Iterate over the rounds, each one is the list of its records (the dealer is the last)"""
+        records: list[HandRecord] = []
+        for record in self:
+            records.append(record)
+            if record.isDealer:
+                yield records
+                records = []
+
+    def find_round(self, roundIndex: int) -> list[HandRecord]:
+        """Return the records of a round, found by binary search on the round index"""
+        low, high = 0, self.recordNbr
+        while low < high:
+            middle: int = (low + high) // 2
+            if self[middle].round < roundIndex:
+                low = middle + 1
+            else:
+                high = middle
+        records: list[HandRecord] = []
+        while low < self.recordNbr and self[low].round == roundIndex:
+            records.append(self[low])
+            low += 1
+        if not records:
+            raise KeyError(f"round {roundIndex} is not in the history")
+        return records
+
+    def close(self) -> None:
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
+
+    def __enter__(self) -> "HistoryReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,77 @@
+# --- External libraries ---
+import json
+import os
+from functools import wraps
+from time import perf_counter
+
+# --- Internal libraries ---
+from player import PlayerActions
+
+
+# --- Functions ---
+def timed(func):
+    """Record the wall time of a method in the instrumentation of its object, if there is one"""
+    phase: str = func.__qualname__
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return func(self, *args, **kwargs)
+        start: float = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            instrumentation.add_time(phase, perf_counter() - start)
+    return wrapper
+
+
+# --- Classes ---
+class Instrumentation:
+    """Wall time per phase and counters of a table, exported every exportEvery rounds if exportPath is set"""
+    def __init__(self, exportPath: str | None = None, exportEvery: int = 1000) -> None:
+        if exportEvery < 1:
+            raise ValueError("exportEvery must be greater than 0")
+        self.exportPath: str | None = exportPath
+        self.exportEvery: int = exportEvery
+        self.roundNbr: int = 0
+        self.phaseTimes: dict[str, float] = {}
+        self.phaseCalls: dict[str, int] = {}
+        self.counters: dict[str, int] = {"cards_drawn": 0, "reshuffles": 0}
+        self.actions: dict[PlayerActions, int] = {action: 0 for action in PlayerActions}
+
+    def add_time(self, phase: str, seconds: float) -> None:
+        """Add one call of a phase"""
+        self.phaseTimes[phase] = self.phaseTimes.get(phase, 0.0) + seconds
+        self.phaseCalls[phase] = self.phaseCalls.get(phase, 0) + 1
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Increment a counter"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_action(self, action: PlayerActions) -> None:
+        """Count an action played by a player"""
+        self.actions[action] += 1
+
+    def end_round(self) -> None:
+        """Count a finished round and export the snapshot when it is time to"""
+        self.roundNbr += 1
+        if self.exportPath is not None and self.roundNbr % self.exportEvery == 0:
+            self.export(self.exportPath)
+
+    def snapshot(self) -> dict:
+        """Return everything recorded so far as a dict"""
+        return {
+            "rounds": self.roundNbr,
+            "phases": {phase: {"calls": self.phaseCalls[phase], "seconds": seconds}
+                       for phase, seconds in self.phaseTimes.items()},
+            "counters": dict(self.counters),
+            "actions": {action.value: count for action, count in self.actions.items()},
+        }
+
+    def export(self, path: str) -> None:
+        """Write the snapshot to a JSON file, replacing it atomically"""
+        temporaryPath: str = f"{path}.tmp"
+        with open(temporaryPath, "w") as file:
+            json.dump(self.snapshot(), file, indent=2)
+        os.replace(temporaryPath, path)
@@ -0,0 +1,103 @@
+# --- External libraries ---
+from array import array
+from random import Random
+
+# --- Internal libraries ---
+from card import Card, CardValues, CardSuits, RANK_VALUES
+from hand_state import EMPTY_STATE, POINT_ROW, TRANSITIONS, VALUES
+
+
+# --- Constants ---
+# A card is encoded as rank * 4 + suit, ranks go from TWO (0) to ACE (12)
+RANKS: tuple[CardValues, ...] = RANK_VALUES
+SUITS: tuple[CardSuits, ...] = tuple(CardSuits)
+CARD_NBR = len(RANKS) * len(SUITS)
+ACE_RANK = len(RANKS) - 1
+
+# Points of each card code, the aces are counted as 1 and upgraded to 11 when it does not bust
+HARD_POINTS: bytes = bytes(1 if code >> 2 == ACE_RANK else RANKS[code >> 2].value for code in range(CARD_NBR))
+
+
+# --- Functions ---
+def encode(rank: int, suit: int) -> int:
+    """Return the code of a card from its rank and suit indexes"""
+    return rank << 2 | suit
+
+def to_card(code: int) -> Card:
+    """Return the Card object of a code, only needed to display it"""
+    return Card(RANKS[code >> 2], SUITS[code & 3], code >> 2)
+
+def from_card(card: Card) -> int:
+    """Return the code of a Card object"""
+    return card.code
+
+def hand_value(codes) -> int:
+    """Return the best value of a hand of card codes"""
+    state: int = EMPTY_STATE
+    for code in codes:
+        state = TRANSITIONS[state * POINT_ROW + HARD_POINTS[code]]
+    return VALUES[state]
+
+
+# --- Classes ---
+class IntShoe:
+    def __init__(self, deckNbr: int = 1, penetration: float = 0.75, rng: Random | None = None) -> None:
+        if deckNbr < 1:
+            raise ValueError("deckNbr must be greater than 0")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be between 0 and 1")
+        self.cards: array = array('B', range(CARD_NBR)) * deckNbr
+        self.position: int = 0  # Index of the next card to draw
+        self.cutCard: int = len(self.cards) - int(len(self.cards) * penetration)
+        self.rng: Random = rng if rng is not None else Random()
+        self.reshuffle()
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    @property
+    def remaining(self) -> int:
+        """Return the number of cards left in the shoe"""
+        return len(self.cards) - self.position
+
+    @property
+    def needsShuffle(self) -> bool:
+        """Return True if the cut card has been reached"""
+        return self.remaining <= self.cutCard
+
+    def reshuffle(self) -> None:
+        """Put every card back in the shoe and shuffle it"""
+        self.rng.shuffle(self.cards)
+        self.position = 0
+
+    def pick_card(self) -> int:
+        """Pick the code of the card on top of the shoe, reshuffle if it is empty"""
+        if self.position >= len(self.cards):
+            self.reshuffle()
+        self.position += 1
+        return self.cards[self.position - 1]
+
+    def draw(self, cardNbr: int) -> array:
+        """Pick cardNbr card codes from the shoe, reshuffle first if there are not enough"""
+        if self.remaining < cardNbr:
+            self.reshuffle()
+        self.position += cardNbr
+        return self.cards[self.position - cardNbr:self.position]
+
+
+class IntStack(bytearray):
+    """A hand of card codes"""
+
+    @property
+    def value(self) -> int:
+        """Return the value of the stack"""
+        return hand_value(self)
+
+    @property
+    def cards(self) -> str:
+        """Return the cards of the stack"""
+        return " ".join(str(to_card(code)) for code in self)
+
+    def is_splitable(self) -> bool:
+        """Return True if the stack can be splitted"""
+        return len(self) == 2 and HARD_POINTS[self[0]] == HARD_POINTS[self[1]]
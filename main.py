@@ -1,9 +1,81 @@
-from game_manager import GameManager
+# --- External libraries ---
+import argparse
+import json
+import sys
+from functools import partial
+from typing import TextIO
 
-def main():
-    game = GameManager()
+
+# --- Functions ---
+def load_strategy(name: str):
+    """Return the strategy.Strategy of a command line name, None for mimic (played by the engine callback)"""
+    if name == "mimic":
+        return None
+    # NumPy is only loaded by the strategies that need it
+    from strategy import parse_strategy
+    return parse_strategy(name)
+
+def play(args: argparse.Namespace) -> None:
+    """Play an interactive game in the terminal"""
+    # The renderer and termcolor are only loaded by the interactive game
+    from game_manager import GameManager
+
+    game = GameManager(args.players, args.decks, checkpointPath=args.checkpoint)
     game.run()
 
+def simulate(args: argparse.Namespace) -> None:
+    """Simulate rounds without rendering, write one JSON line per chunk then the total"""
+    from parallel import SimulationSummary, engine_chunk, iter_chunks
+
+    task = partial(engine_chunk, playerNbr=args.players, deckNbr=args.decks, bet=args.bet,
+                   checkpointPath=args.checkpoint, checkpointEvery=args.checkpoint_every,
+                   strategy=load_strategy(args.strategy))
+    output: TextIO = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        total = SimulationSummary()
+        for chunkIndex, summary in enumerate(iter_chunks(task, args.rounds, args.seed, args.workers, args.chunk_size)):
+            total.merge(summary)
+            output.write(json.dumps({"chunk": chunkIndex, **summary.as_dict()}) + "\n")
+            output.flush()
+        output.write(json.dumps({"total": True, "rounds": args.rounds, **total.as_dict()}) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Return the command line arguments, the play command is the default"""
+    parser = argparse.ArgumentParser(description="Blackjack")
+    commands = parser.add_subparsers(dest="command")
+
+    playParser = commands.add_parser("play", help="play in the terminal")
+    playParser.add_argument("--players", type=int, default=1)
+    playParser.add_argument("--decks", type=int, default=1)
+    playParser.add_argument("--checkpoint", help="file saving the table after every round, resumed if it exists")
+    playParser.set_defaults(run=play)
+
+    simulateParser = commands.add_parser("simulate", help="simulate rounds without rendering")
+    simulateParser.add_argument("--rounds", type=int, default=100_000)
+    simulateParser.add_argument("--players", type=int, default=1)
+    simulateParser.add_argument("--decks", type=int, default=6)
+    simulateParser.add_argument("--seed", type=int, default=0)
+    simulateParser.add_argument("--workers", type=int, default=1, help="0 for one per CPU")
+    simulateParser.add_argument("--strategy", default="mimic", help="mimic, random or table:<path>")
+    simulateParser.add_argument("--bet", type=int, default=2)
+    simulateParser.add_argument("--chunk-size", type=int, default=10_000)
+    simulateParser.add_argument("--output", default="-", help="file of the JSON lines, - for stdout")
+    simulateParser.add_argument("--checkpoint", help="path prefix of the chunk checkpoints, a rerun resumes from them")
+    simulateParser.add_argument("--checkpoint-every", type=int, default=10_000, help="rounds between two saves of a chunk")
+    simulateParser.set_defaults(run=simulate)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args(["play"])
+    return args
+
+def main(argv: list[str] | None = None):
+    args = parse_args(argv)
+    args.run(args)
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
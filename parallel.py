@@ -0,0 +1,156 @@
+# --- External libraries ---
+import os
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from functools import reduce
+from itertools import repeat
+from random import Random
+from typing import Callable, Iterator
+
+# --- Internal libraries ---
+from checkpoint import Checkpointer
+from engine import RoundEngine, StackOutcome, DecisionCallback, mimic_dealer, player_decision
+
+
+# --- Constants ---
+OUTCOMES: tuple[StackOutcome, ...] = tuple(StackOutcome)
+DEFAULT_CHUNK_SIZE = 10_000
+
+ChunkTask = Callable[[int, int, int], "SimulationSummary"]
+
+
+# --- Classes ---
+class SimulationSummary:
+    """Aggregated results of simulated stacks, can be merged with other summaries"""
+    def __init__(self) -> None:
+        self.stackNbr: int = 0
+        self.netTotal: float = 0
+        self.netSquares: float = 0
+        self.outcomeCounts: list[int] = [0] * len(OUTCOMES)
+
+    @property
+    def ev(self) -> float:
+        """Return the mean net result per stack"""
+        return self.netTotal / self.stackNbr if self.stackNbr else 0.0
+
+    @property
+    def variance(self) -> float:
+        """Return the variance of the net result per stack"""
+        if self.stackNbr < 2:
+            return 0.0
+        return (self.netSquares - self.netTotal * self.ev) / (self.stackNbr - 1)
+
+    def add(self, outcome: StackOutcome, net: float) -> None:
+        """Add the result of one stack"""
+        self.stackNbr += 1
+        self.netTotal += net
+        self.netSquares += net * net
+        self.outcomeCounts[OUTCOMES.index(outcome)] += 1
+
+    def merge(self, other: "SimulationSummary") -> "SimulationSummary":
+        """Add the results of another summary to this one"""
+        self.stackNbr += other.stackNbr
+        self.netTotal += other.netTotal
+        self.netSquares += other.netSquares
+        self.outcomeCounts = [count + otherCount for count, otherCount in zip(self.outcomeCounts, other.outcomeCounts)]
+        return self
+
+    def as_dict(self) -> dict:
+        """Return the summary as a dict"""
+        return {
+            "stacks": self.stackNbr,
+            "ev": self.ev,
+            "variance": self.variance,
+            "outcomes": {outcome.value: count for outcome, count in zip(OUTCOMES, self.outcomeCounts)},
+        }
+
+
+# --- Functions ---
+def chunk_random(seed: int, chunkIndex: int) -> Random:
+    """Return the RNG of a chunk, it only depends on the seed and the chunk index"""
+    return Random(f"{seed}:{chunkIndex}")
+
+def engine_chunk(roundNbr: int, seed: int, chunkIndex: int, decide: DecisionCallback = mimic_dealer,
+                 playerNbr: int = 1, deckNbr: int = 6, bet: int = 2, checkpointPath: str | None = None,
+                 checkpointEvery: int = 10_000, strategy=None) -> SimulationSummary:
+    """Play roundNbr rounds with a RoundEngine, the bankrolls are refilled before every round.
+
+    With a strategy.Strategy, every player follows it instead of the decide callback.
+    With a checkpointPath, the chunk is saved every checkpointEvery rounds to its own file
+    and a restarted chunk resumes from it with the same results.
+    """
+    engine = RoundEngine(playerNbr, player_decision if strategy is not None else decide, lambda player: bet,
+                         deckNbr, rng=chunk_random(seed, chunkIndex))
+    if strategy is not None:
+        strategy = deepcopy(strategy)
+        if hasattr(strategy, "rng"):
+            # A strategy with its own RNG draws from the one of the chunk instead: its decisions differ
+            # from chunk to chunk and its state is saved with the shoe by the checkpoints
+            strategy.rng = engine.deck.rng
+        if hasattr(strategy, "counter"):
+            # The copied counter still follows the deck it was built on, it counts the shoe of the chunk instead
+            strategy.counter.deck = engine.deck
+            strategy.counter.reset()
+            engine.deck.counter = strategy.counter
+    for player in engine.players:
+        player.strategy = strategy
+    summary = SimulationSummary()
+    checkpointer = None
+    playedNbr: int = 0
+    if checkpointPath is not None:
+        checkpointer = Checkpointer(f"{checkpointPath}.{chunkIndex}", checkpointEvery)
+        playedNbr = checkpointer.resume(engine, summary)
+    while playedNbr < roundNbr:
+        for player in engine.players:
+            player.totalMoney = bet * 1000
+        for _, _, outcome, amount in engine.play_round():
+            summary.add(outcome, amount / bet)
+        playedNbr += 1
+        if checkpointer is not None:
+            checkpointer.end_round(engine, playedNbr, summary)
+    return summary
+
+def batch_chunk(shoeNbr: int, seed: int, chunkIndex: int, table=None,
+                deckNbr: int = 6, penetration: float = 0.75) -> SimulationSummary:
+    """Play shoeNbr shoes with the BatchSimulator"""
+    # NumPy is only needed by the batch simulator, not by the engine chunks
+    import numpy as np
+    from batch import BatchSimulator, mimic_dealer_table
+
+    simulator = BatchSimulator(mimic_dealer_table() if table is None else table, deckNbr, penetration,
+                               np.random.default_rng([seed, chunkIndex]))
+    nets, outcomes = simulator.simulate(shoeNbr)
+    summary = SimulationSummary()
+    summary.stackNbr = len(nets)
+    summary.netTotal = float(nets.sum())
+    summary.netSquares = float(np.square(nets).sum())
+    summary.outcomeCounts = np.bincount(outcomes, minlength=len(OUTCOMES)).tolist()
+    return summary
+
+def chunk_sizes(unitNbr: int, chunkSize: int = DEFAULT_CHUNK_SIZE) -> list[int]:
+    """Return the sizes of the chunks of unitNbr units, the last one holds the rest"""
+    sizes: list[int] = [chunkSize] * (unitNbr // chunkSize)
+    if unitNbr % chunkSize:
+        sizes.append(unitNbr % chunkSize)
+    return sizes
+
+def iter_chunks(task: ChunkTask, unitNbr: int, seed: int, workerNbr: int | None = None,
+                chunkSize: int = DEFAULT_CHUNK_SIZE) -> Iterator[SimulationSummary]:
+    """Yield the summary of every chunk in order, as soon as it and the ones before it are done"""
+    sizes: list[int] = chunk_sizes(unitNbr, chunkSize)
+    workerNbr = workerNbr or os.cpu_count() or 1
+
+    if workerNbr == 1:
+        yield from map(task, sizes, repeat(seed), range(len(sizes)))
+        return
+    with ProcessPoolExecutor(min(workerNbr, len(sizes)) or 1) as pool:
+        yield from pool.map(task, sizes, repeat(seed), range(len(sizes)))
+
+def run_parallel(task: ChunkTask, unitNbr: int, seed: int, workerNbr: int | None = None,
+                 chunkSize: int = DEFAULT_CHUNK_SIZE) -> SimulationSummary:
+    """Split unitNbr units of work (rounds or shoes) into chunks, run them on a process pool and merge the results.
+
+    The chunks and their seeds do not depend on workerNbr and are merged in order,
+    so a seed always gives the same summary whatever the number of workers.
+    """
+    return reduce(SimulationSummary.merge, iter_chunks(task, unitNbr, seed, workerNbr, chunkSize), SimulationSummary())
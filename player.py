@@ -18,10 +18,11 @@ class PlayerActions(Enum):
 
 # --- Classes ---
 class Player:
-    def __init__(self, username: str, totalMoney: int = 1000) -> None:
+    def __init__(self, username: str, totalMoney: int = 1000, strategy=None) -> None:
         self.stacks: dict[int, Stack] = {}
         self.totalMoney: int = totalMoney
         self.username: str = username
+        self.strategy = strategy  # Optional strategy.Strategy deciding the actions, a human is asked without one
         
     @property
     def isPlaying(self):
@@ -50,9 +51,16 @@ class Player:
                 actions.append(PlayerActions.SPLIT)
         return actions
         
-    def choose_action(self, stack_index: int) -> PlayerActions | None:
-        """Choose an action to do on a given stack"""
+    @property
+    def isBot(self) -> bool:
+        """Return True if a strategy plays for the player"""
+        return self.strategy is not None
+
+    def choose_action(self, stack_index: int, upCard: Card | None = None) -> PlayerActions | None:
+        """Choose an action to do on a given stack, with the strategy of the player or by asking it"""
         possibleActions: list[PlayerActions] = self.get_possible_actions(stack_index)
+        if self.strategy is not None:
+            return self.strategy.choose_action(self.stacks[stack_index], possibleActions, upCard)
         possibleActionsValues: list[str] = [action.value for action in possibleActions]
         while True:
             try:
@@ -66,7 +74,10 @@ class Player:
             
         return PlayerActions(actionInput)
     
-    def split(self):
-        """Split the hand into two stacks"""
-        newStack: Stack = Stack(bet=self.stacks[0].bet, card=self.stacks[0].pop(1))
-        self.stacks[1] = newStack
+    def split(self, stackIndex: int = 0) -> int:
+        """Split a stack into two stacks and return the index of the new one"""
+        newIndex: int = len(self.stacks)
+        newStack: Stack = Stack(bet=self.stacks[stackIndex].bet)
+        newStack.append(self.stacks[stackIndex].pop(1))
+        self.stacks[newIndex] = newStack
+        return newIndex
@@ -0,0 +1,60 @@
+# --- External libraries ---
+import sys
+from time import perf_counter, sleep
+from typing import TextIO
+
+
+# --- Constants ---
+CLEAR_SCREEN = "\x1b[2J\x1b[H"
+CLEAR_LINE_END = "\x1b[K"
+CLEAR_SCREEN_END = "\x1b[J"
+
+
+# --- Functions ---
+def move_cursor(line: int) -> str:
+    """Return the escape sequence moving the cursor to the start of a line (0 is the first one)"""
+    return f"\x1b[{line + 1};1H"
+
+
+# --- Classes ---
+class FrameRenderer:
+    """Draw frames with ANSI escapes, rewriting only the lines that changed since the previous frame"""
+    def __init__(self, stream: TextIO | None = None, maxFps: float = 0) -> None:
+        self.stream: TextIO | None = stream  # None follows sys.stdout, even when it is redirected later
+        self.frameDelay: float = 1 / maxFps if maxFps > 0 else 0.0
+        self.lastFrameTime: float = 0.0
+        self.previousLines: list[str] | None = None  # None until the screen is cleared
+
+    @property
+    def output(self) -> TextIO:
+        """Return the stream the frames are written to"""
+        return sys.stdout if self.stream is None else self.stream
+
+    def clear(self) -> None:
+        """Clear the screen, the next frame is drawn entirely"""
+        output: TextIO = self.output
+        output.write(CLEAR_SCREEN)
+        output.flush()
+        self.previousLines = []
+
+    def render(self, lines: list[str]) -> None:
+        """Draw a frame in a single write, waiting if it comes faster than the frame rate cap"""
+        if self.frameDelay:
+            wait: float = self.lastFrameTime + self.frameDelay - perf_counter()
+            if wait > 0:
+                sleep(wait)
+        self.lastFrameTime = perf_counter()
+
+        buffer: list[str] = []
+        if self.previousLines is None:
+            buffer.append(CLEAR_SCREEN)
+            self.previousLines = []
+        for lineIndex, line in enumerate(lines):
+            if lineIndex >= len(self.previousLines) or self.previousLines[lineIndex] != line:
+                buffer.append(move_cursor(lineIndex) + line + CLEAR_LINE_END)
+        # Erase what is left under the frame (longer previous frame, prints and inputs)
+        buffer.append(move_cursor(len(lines)) + CLEAR_SCREEN_END)
+        output: TextIO = self.output
+        output.write("".join(buffer))
+        output.flush()
+        self.previousLines = list(lines)
@@ -0,0 +1,251 @@
+# --- External libraries ---
+import argparse
+import asyncio
+
+# --- Internal libraries ---
+from card import Card
+from engine import RoundEngine, mimic_dealer
+from player import Player, PlayerActions
+from stack import Stack
+
+
+# --- Constants ---
+DEFAULT_ACTION = PlayerActions.STAND  # Played when a client does not answer in time
+DEFAULT_DECISION_TIMEOUT = 30.0
+START_MONEY = 1000
+BACKLOG = 4096
+
+# Line protocol, every message is one line of space separated fields.
+# Server to client:
+#   WELCOME <table> <seat>
+#   BET <id> <money> <minBet>                                   -> the client answers a bet
+#   TURN <id> <stack> <cards> <value> <dealer up card> <actions> -> the client answers an action (hit, stand...)
+#   DEALER <cards> <value>
+#   RESULT <stack> <outcome> <amount> <money>
+#   BYE                                                         (not enough money left)
+# Cards are written as value+suit and separated by commas.
+# Client to server, the answer to a prompt starts with its id: "<id> <answer>". An answer to
+# an older prompt (sent after its timeout) is skipped, it can't be taken for the current one.
+
+
+# --- Functions ---
+def card_text(card: Card) -> str:
+    """Return a plain text representation of a card for the protocol"""
+    return f"{card.base_value}{card.suit.value}"
+
+def stack_text(stack: Stack) -> str:
+    """Return the cards of a stack for the protocol"""
+    return ",".join(card_text(card) for card in stack)
+
+
+# --- Classes ---
+class Seat:
+    """A client sitting at a table"""
+    def __init__(self, player: Player, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.player: Player = player
+        self.reader: asyncio.StreamReader = reader
+        self.writer: asyncio.StreamWriter = writer
+        self.connected: bool = True
+        self.closed: asyncio.Event = asyncio.Event()
+        self.promptId: int = 0  # Id of the last prompt sent to the client
+
+    async def send(self, line: str) -> None:
+        """Send a line to the client"""
+        if not self.connected:
+            return
+        try:
+            self.writer.write(f"{line}\n".encode())
+            await self.writer.drain()
+        except ConnectionError:
+            self.connected = False
+
+    async def ask(self, line: str, timeout: float) -> str | None:
+        """Send a prompt with a new id and return the answer of the client, None on timeout or disconnection"""
+        self.promptId += 1
+        kind, _, fields = line.partition(" ")
+        await self.send(f"{kind} {self.promptId} {fields}")
+        loop = asyncio.get_running_loop()
+        deadline: float = loop.time() + timeout
+        while self.connected:
+            try:
+                answer: bytes = await asyncio.wait_for(self.reader.readline(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                return None
+            except (ConnectionError, ValueError, asyncio.IncompleteReadError):
+                # A line over the limit of the reader (ValueError) is treated like a disconnection
+                answer = b""
+            if not answer:
+                self.connected = False
+                return None
+            promptId, _, reply = answer.decode(errors="replace").strip().partition(" ")
+            if promptId == str(self.promptId):
+                return reply.strip()
+        return None
+
+
+class AsyncTable:
+    """A table whose bets and actions come from clients, driven step by step on the RoundEngine"""
+    def __init__(self, index: int, seatNbr: int, deckNbr: int, minBet: int, decisionTimeout: float) -> None:
+        self.index: int = index
+        # The callbacks of the engine are not used, the table asks the clients itself
+        self.engine = RoundEngine(seatNbr, mimic_dealer, lambda player: minBet, deckNbr)
+        self.minBet: int = minBet
+        self.decisionTimeout: float = decisionTimeout
+        self.seats: dict[Player, Seat] = {}
+        self.task: asyncio.Task | None = None
+
+    @property
+    def hasFreeSeat(self) -> bool:
+        """Return True if a client can still sit at the table"""
+        return len(self.seats) < len(self.engine.players)
+
+    def join(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> Seat:
+        """Sit a client on a free seat and start the table if it was empty"""
+        player: Player = next(player for player in self.engine.players if player not in self.seats)
+        player.totalMoney = START_MONEY
+        seat = Seat(player, reader, writer)
+        self.seats[player] = seat
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        return seat
+
+    def leave(self, player: Player) -> None:
+        """Free the seat of a player"""
+        seat: Seat = self.seats.pop(player)
+        seat.closed.set()
+
+    async def ask_bet(self, seat: Seat) -> int:
+        """Ask the bet of a client, the minimum bet if the answer is missing or invalid"""
+        answer = await seat.ask(f"BET {seat.player.totalMoney} {self.minBet}", self.decisionTimeout)
+        try:
+            bet = int(answer)
+        except (TypeError, ValueError):
+            return self.minBet
+        return min(max(bet, self.minBet), seat.player.totalMoney)
+
+    async def ask_action(self, seat: Seat, stackIndex: int) -> PlayerActions:
+        """Ask an action to a client, the default action if the answer is missing or invalid"""
+        player: Player = seat.player
+        stack: Stack = player.stacks[stackIndex]
+        possibleActions: list[PlayerActions] = player.get_possible_actions(stackIndex)
+        answer = await seat.ask(f"TURN {stackIndex} {stack_text(stack)} {stack.value} {card_text(self.engine.upCard)} "
+                                f"{','.join(action.value for action in possibleActions)}", self.decisionTimeout)
+        for action in possibleActions:
+            if action.value == answer:
+                return action
+        return DEFAULT_ACTION
+
+    async def player_turn(self, player: Player) -> None:
+        """Play every stack of a player, like RoundEngine.player_turn with asynchronous decisions"""
+        seat: Seat = self.seats[player]
+        stackIndex = 0
+        while stackIndex < len(player.stacks):
+            while self.engine.is_stack_playing(player, stackIndex):
+                self.engine.apply_action(player, stackIndex, await self.ask_action(seat, stackIndex))
+            stackIndex += 1
+
+    async def play_round(self) -> None:
+        """Play one round with the clients seated at the table"""
+        engine = self.engine
+        engine.prepare_round()
+        for player, seat in list(self.seats.items()):
+            if player.totalMoney < self.minBet:
+                await seat.send("BYE")
+                self.leave(player)
+                continue
+            player.set_initial_stack(await self.ask_bet(seat))
+        if not engine.seatedPlayers:
+            return
+
+        engine.deal_starting_cards()
+        for player in engine.seatedPlayers:
+            await self.player_turn(player)
+        engine.dealer_turn()
+        results = engine.compare_hands()
+        engine.end_round()
+
+        dealerStack: Stack = engine.dealer.stacks[0]
+        for seat in self.seats.values():
+            await seat.send(f"DEALER {stack_text(dealerStack)} {dealerStack.value}")
+        for player, stackIndex, outcome, amount in results:
+            await self.seats[player].send(f"RESULT {stackIndex} {outcome.value} {amount} {player.totalMoney}")
+        for player, seat in list(self.seats.items()):
+            if not seat.connected:
+                self.leave(player)
+
+    async def run(self) -> None:
+        """Play rounds as long as there are clients at the table"""
+        try:
+            while self.seats:
+                await self.play_round()
+        finally:
+            # If a round fails, the clients still seated are released instead of waiting forever
+            for player in list(self.seats):
+                self.leave(player)
+
+
+class TableServer:
+    """Host many tables in one process, every client gets a seat at the first table with a free one"""
+    def __init__(self, seatNbr: int = 7, deckNbr: int = 6, minBet: int = 10,
+                 decisionTimeout: float = DEFAULT_DECISION_TIMEOUT, maxTables: int = 1000) -> None:
+        self.seatNbr: int = seatNbr
+        self.deckNbr: int = deckNbr
+        self.minBet: int = minBet
+        self.decisionTimeout: float = decisionTimeout
+        self.maxTables: int = maxTables
+        self.tables: list[AsyncTable] = []
+
+    def find_table(self) -> AsyncTable | None:
+        """Return a table with a free seat, open a new one if needed"""
+        for table in self.tables:
+            if table.hasFreeSeat:
+                return table
+        if len(self.tables) >= self.maxTables:
+            return None
+        table = AsyncTable(len(self.tables), self.seatNbr, self.deckNbr, self.minBet, self.decisionTimeout)
+        self.tables.append(table)
+        return table
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Seat a new client and keep its connection open until it leaves its table"""
+        table = self.find_table()
+        if table is None:
+            writer.write(b"FULL\n")
+        else:
+            seat = table.join(reader, writer)
+            await seat.send(f"WELCOME {table.index} {seat.player.username}")
+            await seat.closed.wait()
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, path: str | None = None) -> None:
+        """Accept clients forever, on a Unix socket if a path is given, otherwise over TCP"""
+        # A large backlog so that hundreds of clients can connect at once
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle_client, path, backlog=BACKLOG)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port, backlog=BACKLOG)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host blackjack tables for clients speaking the line protocol")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--seats", type=int, default=7, help="seats per table")
+    parser.add_argument("--decks", type=int, default=6)
+    parser.add_argument("--min-bet", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_DECISION_TIMEOUT, help="seconds to answer a decision")
+    args = parser.parse_args()
+
+    server = TableServer(args.seats, args.decks, args.min_bet, args.timeout)
+    asyncio.run(server.serve(args.host, args.port, args.unix))
+
+
+if __name__ == "__main__":
+    main()
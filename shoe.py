@@ -0,0 +1,46 @@
+# --- External libraries ---
+from random import Random
+
+# --- Internal libraries ---
+from card import Card
+from deck import Deck
+
+
+# --- Classes ---
+class Shoe(Deck):
+    def __init__(self, deckNbr: int = 6, penetration: float = 0.75, rng: Random | None = None) -> None:
+        super().__init__(rng)
+        if deckNbr < 1:
+            raise ValueError("deckNbr must be greater than 0")
+        if not 0 < penetration <= 1:
+            raise ValueError("penetration must be between 0 and 1")
+        self.deckNbr: int = deckNbr
+        self.penetration: float = penetration
+        self.cutCard: int = 0  # Number of remaining cards at which the shoe is reshuffled
+        self.reshuffleNbr: int = -1  # The first shuffle below brings it to 0, only the later reshuffles count
+        self.generate(deckNbr)
+        self.reshuffle()
+
+    @property
+    def needsShuffle(self) -> bool:
+        """Return True if the cut card has been reached"""
+        return self.remaining <= self.cutCard
+
+    def reshuffle(self) -> None:
+        """Put every card back in the shoe, shuffle it and place the cut card"""
+        # Drawing only moves the position, the shoe still holds every card and is shuffled in place
+        self.shuffle()
+        self.cutCard = len(self) - int(len(self) * self.penetration)
+        self.reshuffleNbr += 1
+
+    def pick_card(self, card_index: int = 1) -> Card | None:
+        """Pick a card and remove it from the shoe, reshuffle if it is empty"""
+        if self.remaining < 1:
+            self.reshuffle()
+        return super().pick_card(card_index)
+
+    def draw(self, cardNbr: int) -> list[Card]:
+        """Pick cardNbr cards from the shoe, reshuffle first if there are not enough"""
+        if self.remaining < cardNbr:
+            self.reshuffle()
+        return super().draw(cardNbr)
@@ -0,0 +1,167 @@
+# --- External libraries ---
+from functools import lru_cache
+
+import numpy as np
+
+# --- Internal libraries ---
+from batch import HARD, SOFT, PAIR, STAND, HIT, DOUBLE, SPLIT, DOUBLE_STAND, TABLE_SHAPE
+from dealer_probs import BUST, FINAL_TOTALS, POINT_NBR, dealer_distribution, remove_card, shoe_composition
+from hand_state import BLACKJACK_VALUE, DEALER_STAND_VALUE
+
+
+# --- Constants ---
+SOLVER_CACHE_SIZE = 1 << 20
+STRATEGY_SHAPE = (3,) + TABLE_SHAPE[1:]
+UP_VALUES = range(2, 12)  # Dealer up card values, 11 for an ace
+
+
+# --- Functions ---
+def hand_value(hardTotal: int, hasAce: bool) -> int:
+    """Return the value of a hand from its hard total"""
+    return hardTotal + 10 if hasAce and hardTotal <= 11 else hardTotal
+
+def next_counts(counts: tuple[int, ...], index: int) -> tuple[int, ...]:
+    """Return the composition after drawing a card of the given index"""
+    return counts[:index] + (counts[index] - 1,) + counts[index + 1:]
+
+@lru_cache(maxsize=SOLVER_CACHE_SIZE)
+def stand_ev(value: int, upValue: int, counts: tuple[int, ...]) -> float:
+    """Return the expected value of standing on a value"""
+    distribution = dealer_distribution(upValue, counts)
+    ev: float = distribution[BUST]
+    for total, probability in zip(FINAL_TOTALS, distribution):
+        ev += probability * ((value > total) - (value < total))
+    return ev
+
+@lru_cache(maxsize=SOLVER_CACHE_SIZE)
+def hit_ev(hardTotal: int, hasAce: bool, upValue: int, counts: tuple[int, ...],
+           dealerCounts: tuple[int, ...]) -> float:
+    """Return the expected value of hitting, then playing the best of hit and stand.
+
+    The player draws from counts, the dealer distribution is computed on dealerCounts: the
+    composition at the decision. Not removing every card the player draws from the dealer
+    composition keeps the number of dealer distributions to one per decision.
+    """
+    ev: float = 0.0
+    cardNbr: int = sum(counts)
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        nextHard: int = hardTotal + index + 1
+        nextAce: bool = hasAce or index == 0
+        value: int = hand_value(nextHard, nextAce)
+        if value > BLACKJACK_VALUE:
+            cardEv = -1.0
+        elif value == BLACKJACK_VALUE:  # 21 wins right away
+            cardEv = 1.0
+        else:
+            cardEv = max(stand_ev(value, upValue, dealerCounts),
+                         hit_ev(nextHard, nextAce, upValue, next_counts(counts, index), dealerCounts))
+        ev += count / cardNbr * cardEv
+    return ev
+
+def double_ev(hardTotal: int, hasAce: bool, upValue: int, counts: tuple[int, ...]) -> float:
+    """Return the expected value of doubling: one card for twice the bet"""
+    ev: float = 0.0
+    cardNbr: int = sum(counts)
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        value: int = hand_value(hardTotal + index + 1, hasAce or index == 0)
+        if value > BLACKJACK_VALUE:
+            cardEv = -1.0
+        elif value == BLACKJACK_VALUE:
+            cardEv = 1.0
+        else:
+            cardEv = stand_ev(value, upValue, counts)
+        ev += count / cardNbr * cardEv
+    return 2 * ev
+
+def two_cards_ev(hardTotal: int, hasAce: bool, upValue: int, counts: tuple[int, ...]) -> float:
+    """Return the expected value of a two cards hand played with the best of stand, hit and double"""
+    value: int = hand_value(hardTotal, hasAce)
+    if value == BLACKJACK_VALUE:  # Paid 3:2, even after a split (Stack.isBlackjack)
+        return 1.5
+    return max(stand_ev(value, upValue, counts), hit_ev(hardTotal, hasAce, upValue, counts, counts),
+               double_ev(hardTotal, hasAce, upValue, counts))
+
+def split_ev(points: int, upValue: int, counts: tuple[int, ...]) -> float:
+    """Return the expected value of splitting a pair (no resplit, both stacks see the same composition)"""
+    ev: float = 0.0
+    cardNbr: int = sum(counts)
+    for index, count in enumerate(counts):
+        if count == 0:
+            continue
+        ev += count / cardNbr * two_cards_ev(points + index + 1, points == 1 or index == 0, upValue,
+                                             next_counts(counts, index))
+    return 2 * ev
+
+def action_evs(firstPoints: int, secondPoints: int, upValue: int,
+               counts: tuple[int, ...]) -> dict[int, float]:
+    """Return the expected value of each allowed action for a two cards hand.
+
+    The cards are given by their hard points (1 for an ace), counts is the composition
+    of the shoe before the player cards and the dealer up card are removed.
+    """
+    counts = remove_card(remove_card(counts, firstPoints), secondPoints)
+    counts = remove_card(counts, 1 if upValue == 11 else upValue)
+    hardTotal: int = firstPoints + secondPoints
+    hasAce: bool = firstPoints == 1 or secondPoints == 1
+    evs: dict[int, float] = {
+        STAND: stand_ev(hand_value(hardTotal, hasAce), upValue, counts),
+        HIT: hit_ev(hardTotal, hasAce, upValue, counts, counts),
+        DOUBLE: double_ev(hardTotal, hasAce, upValue, counts),
+    }
+    if firstPoints == secondPoints:
+        evs[SPLIT] = split_ev(firstPoints, upValue, counts)
+    return evs
+
+def representative_cards(kind: int, value: int) -> tuple[int, int] | None:
+    """Return the hard points of a two cards hand of a given kind and value, None if there is none"""
+    if kind == PAIR:
+        points = 1 if value == 11 else value
+        return (points, points) if 2 <= value <= 11 else None
+    if kind == SOFT:
+        return (1, value - 11) if 13 <= value <= 20 else None
+    if not 5 <= value <= 19:
+        return None
+    first: int = min(POINT_NBR, value - 2)  # A ten when possible, otherwise a two, so it is not a pair
+    return first, value - first
+
+def build_tables(counts: tuple[int, ...] | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Solve every two cards hand against every up card.
+
+    Return the strategy table (best action code, indexed like the batch tables with an
+    extra PAIR kind, DOUBLE_STAND when doubling is best and standing beats hitting) and
+    the expected values table (the last axis is the action code,
+    NaN when the action is not allowed).
+    """
+    counts = shoe_composition(6) if counts is None else tuple(counts)
+    table = np.full(STRATEGY_SHAPE, STAND, dtype=np.uint8)
+    table[:, :DEALER_STAND_VALUE, :] = HIT  # Hands that can't be dealt with two cards play like the dealer
+    evs = np.full(STRATEGY_SHAPE + (SPLIT + 1,), np.nan, dtype=np.float32)
+    for kind in (HARD, SOFT, PAIR):
+        for value in range(STRATEGY_SHAPE[1]):
+            cards = representative_cards(kind, value)
+            if cards is None:
+                continue
+            for upValue in UP_VALUES:
+                for action, ev in action_evs(*cards, upValue, counts).items():
+                    evs[kind, value, upValue, action] = ev
+                table[kind, value, upValue] = np.nanargmax(evs[kind, value, upValue])
+                # The same hand can't be doubled after a hit, the code tells whether to stand or hit then
+                handEvs = evs[kind, value, upValue]
+                if table[kind, value, upValue] == DOUBLE and handEvs[STAND] > handEvs[HIT]:
+                    table[kind, value, upValue] = DOUBLE_STAND
+    return table, evs
+
+def save_table(path: str, table: np.ndarray) -> None:
+    """Save a strategy table to a binary .npy file"""
+    np.save(path, table, allow_pickle=False)
+
+def load_table(path: str) -> np.ndarray:
+    """Load a strategy table saved by save_table"""
+    table = np.load(path, allow_pickle=False)
+    if table.shape != STRATEGY_SHAPE:
+        raise ValueError(f"strategy table must have the shape {STRATEGY_SHAPE}")
+    return table
@@ -1,3 +1,18 @@
+# --- Internal libraries ---
+from card import hidden_card_display
+from hand_state import (ACE_POINTS, EMPTY_STATE, POINT_ROW, TRANSITIONS, HARD_TOTALS, VALUES, IS_SOFT,
+                        IS_BLACKJACK, DEALER_HITS, PAIR_POINTS, hand_state)
+
+
+# --- Constants ---
+ACE_VALUE = 11  # Ace is counted as 1 in the hard total, and as 11 when it does not bust
+
+
+# --- Functions ---
+def hard_points(card) -> int:
+    """Return the points of a card, counting an ace as 1"""
+    return ACE_POINTS if card.base_value == ACE_VALUE else card.base_value
+
 
 # --- Clases ---
 class Stack(list):
@@ -5,11 +20,61 @@ class Stack(list):
         super().__init__()
         self.bet: int = bet
         self.isPlaying: bool = True
-        
+        self.isSurrendered: bool = False
+        self.state: int = EMPTY_STATE  # Hand state of the cards, see hand_state
+        # The cards are shared, how they are shown belongs to the stack
+        self.hiddenIndexes: set[int] = set()  # Cards dealt face down
+        self.colored: bool = True
+
+    def append(self, card) -> None:
+        super().append(card)
+        self.state = TRANSITIONS[self.state * POINT_ROW + hard_points(card)]
+
+    def extend(self, cards) -> None:
+        for card in cards:
+            self.append(card)
+
+    def pop(self, index: int = -1):
+        card = super().pop(index)
+        # Only used to split a pair, the state of the remaining card is rebuilt
+        self.state = hand_state(hard_points(card) for card in self)
+        return card
+
+    def clear(self) -> None:
+        super().clear()
+        self.state = EMPTY_STATE
+        self.hiddenIndexes.clear()
+
     @property
     def value(self) -> int:
-        """Return the value of the stack"""
-        return sum(card.value for card in self) 
+        """Return the best value of the stack"""
+        return VALUES[self.state]
+
+    @property
+    def hardTotal(self) -> int:
+        """Return the total of the stack with the aces counted as 1"""
+        return HARD_TOTALS[self.state]
+
+    @property
+    def isSoft(self) -> bool:
+        """Return True if an ace is counted as 11"""
+        return IS_SOFT[self.state]
+
+    @property
+    def isBlackjack(self) -> bool:
+        """Return True if the stack is 21 with two cards"""
+        return IS_BLACKJACK[self.state]
+
+    @property
+    def dealerHits(self) -> bool:
+        """Return True if the dealer has to hit on this stack"""
+        return DEALER_HITS[self.state]
+
+    @property
+    def visibleValue(self) -> int:
+        """Return the value of the visible cards only (for display)"""
+        return VALUES[hand_state(hard_points(card) for index, card in enumerate(self)
+                                 if index not in self.hiddenIndexes)]
     
     @property
     def isAlive(self) -> bool:
@@ -19,21 +84,24 @@ class Stack(list):
     @property
     def cards(self) -> str:
         """Return the cards of the stack"""
-        return " ".join(str(card) for card in self)
+        return " ".join(hidden_card_display() if index in self.hiddenIndexes else card.display if self.colored else card.text
+                        for index, card in enumerate(self))
     
     def uncolor_cards(self):
         """Uncolor the cards of the stack"""
-        for card in self:
-            card.colored = False
+        self.colored = False
     
     def is_splitable(self) -> bool:
         """Return True if the stack can be splitted"""
-        return len(self) == 2 and self[0].value == self[1].value
+        return PAIR_POINTS[self.state] != 0
     
+    def hide_card(self, index: int) -> None:
+        """Turn a card of the stack face down"""
+        self.hiddenIndexes.add(index)
+
     def reveal_cards(self):
         """Reveal the cards of the stack"""
-        for card in self:
-            card.isRevealed = True
+        self.hiddenIndexes.clear()
     
     def end(self):
         """End the stack (for example if the player standed)"""
@@ -42,4 +110,9 @@ class Stack(list):
     def kill(self):
         """Kill the stack (for example if the player surrendered, died or got a blackjack)"""
         self.isPlaying = False
+
+    def surrender(self):
+        """Give up the stack, only half of the bet is lost"""
+        self.isSurrendered = True
+        self.kill()
         
\ No newline at end of file
@@ -0,0 +1,170 @@
+# --- External libraries ---
+from random import Random
+from typing import Protocol
+
+import numpy as np
+
+# --- Internal libraries ---
+from batch import HARD, SOFT, PAIR, STAND, HIT, SPLIT, TABLE_ACTIONS, NO_DOUBLE_CODES, STATE_DEALER_HITS
+from card import Card
+from counting import CardCounter
+from hand_state import BLACKJACK_VALUE, STATE_NBR, VALUES, IS_SOFT, PAIR_POINTS
+from player import PlayerActions
+from stack import Stack
+
+
+# --- Constants ---
+UP_VALUE_NBR = 12  # Up card values are indexes 2 to 11 (11 for an ace)
+ACTION_CODES: dict[PlayerActions, int] = {action: TABLE_ACTIONS.index(action) for action in TABLE_ACTIONS}
+
+# Classic Hi-Lo index plays: (kind, value, dealer up value) -> (true count, action from this
+# count, action under it). The values of the PAIR kind are the value of one card of the pair.
+HI_LO_DEVIATIONS: dict[tuple[int, int, int], tuple[float, PlayerActions, PlayerActions]] = {
+    (HARD, 16, 10): (0, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 15, 10): (4, PlayerActions.STAND, PlayerActions.HIT),
+    (PAIR, 10, 5): (5, PlayerActions.SPLIT, PlayerActions.STAND),
+    (PAIR, 10, 6): (4, PlayerActions.SPLIT, PlayerActions.STAND),
+    (HARD, 10, 10): (4, PlayerActions.DOUBLE, PlayerActions.HIT),
+    (HARD, 12, 3): (2, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 12, 2): (3, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 11, 11): (1, PlayerActions.DOUBLE, PlayerActions.HIT),
+    (HARD, 9, 2): (1, PlayerActions.DOUBLE, PlayerActions.HIT),
+    (HARD, 10, 11): (4, PlayerActions.DOUBLE, PlayerActions.HIT),
+    (HARD, 9, 7): (3, PlayerActions.DOUBLE, PlayerActions.HIT),
+    (HARD, 16, 9): (5, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 13, 2): (-1, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 12, 4): (0, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 12, 5): (-2, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 12, 6): (-1, PlayerActions.STAND, PlayerActions.HIT),
+    (HARD, 13, 3): (-2, PlayerActions.STAND, PlayerActions.HIT),
+}
+
+
+# --- Functions ---
+def state_kinds() -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the table kind (HARD or SOFT), value and pair value (0 if not a pair) of every hand state"""
+    kinds = np.array(IS_SOFT, dtype=np.intp) * (SOFT - HARD) + HARD
+    values = np.minimum(np.array(VALUES, dtype=np.intp), BLACKJACK_VALUE)  # No decision is asked over 21
+    pairPoints = np.array(PAIR_POINTS, dtype=np.intp)
+    pairValues = np.where(pairPoints == 1, 11, pairPoints)
+    return kinds, values, pairValues
+
+def legal_action(code: int, noSplitCode: int, possibleActions: list[PlayerActions]) -> PlayerActions:
+    """Return the action of a table code if it is allowed, else the play without splitting or without doubling"""
+    action: PlayerActions = TABLE_ACTIONS[code]
+    if action in possibleActions:
+        return action
+    if action is PlayerActions.SPLIT:
+        return legal_action(noSplitCode, noSplitCode, possibleActions)
+    if action is PlayerActions.DOUBLE:
+        return legal_action(NO_DOUBLE_CODES[code], noSplitCode, possibleActions)
+    return PlayerActions.STAND
+
+def parse_strategy(name: str) -> "Strategy":
+    """Return a strategy from its command line name: mimic, random or table:<path>"""
+    if name == "mimic":
+        return MimicDealerStrategy()
+    if name == "random":
+        return RandomStrategy(Random(0))
+    if name.startswith("table:"):
+        return TableStrategy.load(name.removeprefix("table:"))
+    raise ValueError(f"unknown strategy {name!r}, expected mimic, random or table:<path>")
+
+
+# --- Classes ---
+class Strategy(Protocol):
+    """Decides the actions of a player, one stack at a time or for many hand states at once"""
+    def choose_action(self, stack: Stack, possibleActions: list[PlayerActions], upCard: Card) -> PlayerActions:
+        """Return the action to play on a stack"""
+        ...
+
+    def choose_actions(self, states: np.ndarray, upValues: np.ndarray) -> np.ndarray:
+        """Return the action codes (batch.STAND, HIT, DOUBLE or SPLIT) of many hand states"""
+        ...
+
+
+class TableStrategy:
+    """Play the actions of a strategy table (see batch and solver), looked up by hand state and up card"""
+    def __init__(self, table: np.ndarray) -> None:
+        if table.ndim != 3 or table.shape[0] < 2 or table.shape[1:] != (BLACKJACK_VALUE + 1, UP_VALUE_NBR):
+            raise ValueError(f"table must have the shape (2 or 3, {BLACKJACK_VALUE + 1}, {UP_VALUE_NBR})")
+        kinds, values, pairValues = state_kinds()
+        # Action codes by [state, up value], without and with the pair rows (optional in the table)
+        self.noSplitCodes: np.ndarray = table[kinds, values]
+        self.codes: np.ndarray = self.noSplitCodes.copy()
+        if table.shape[0] > PAIR:
+            pairs = pairValues > 0
+            self.codes[pairs] = table[PAIR, pairValues[pairs]]
+        # The same codes as lists, faster to read one at a time
+        self.codeRows: list[list[int]] = self.codes.tolist()
+        self.noSplitRows: list[list[int]] = self.noSplitCodes.tolist()
+
+    @classmethod
+    def load(cls, path: str) -> "TableStrategy":
+        """Return the strategy of a table saved by solver.save_table"""
+        from solver import load_table
+        return cls(load_table(path))
+
+    def choose_action(self, stack: Stack, possibleActions: list[PlayerActions], upCard: Card) -> PlayerActions:
+        return legal_action(self.codeRows[stack.state][upCard.base_value],
+                            self.noSplitRows[stack.state][upCard.base_value], possibleActions)
+
+    def choose_actions(self, states: np.ndarray, upValues: np.ndarray) -> np.ndarray:
+        return self.codes[states, upValues]
+
+
+class CountDeviationStrategy(TableStrategy):
+    """Strategy table whose plays change with the true count of a counter (index plays)"""
+    def __init__(self, table: np.ndarray, counter: CardCounter,
+                 deviations: dict[tuple[int, int, int], tuple[float, PlayerActions, PlayerActions]] = HI_LO_DEVIATIONS) -> None:
+        super().__init__(table)
+        self.counter: CardCounter = counter
+        kinds, values, pairValues = state_kinds()
+        # Deviations by (state, up value), a pair state takes the PAIR deviation if there is one.
+        # A pair the table splits keeps its split unless a PAIR deviation changes it.
+        self.deviations: dict[tuple[int, int], tuple[float, PlayerActions, PlayerActions]] = {}
+        for state in range(STATE_NBR):
+            for upValue in range(2, UP_VALUE_NBR):
+                deviation = deviations.get((PAIR, int(pairValues[state]), upValue)) if pairValues[state] else None
+                if deviation is None and self.codes[state, upValue] != SPLIT:
+                    deviation = deviations.get((int(kinds[state]), int(values[state]), upValue))
+                if deviation is not None:
+                    self.deviations[(state, upValue)] = deviation
+
+    def choose_action(self, stack: Stack, possibleActions: list[PlayerActions], upCard: Card) -> PlayerActions:
+        deviation = self.deviations.get((stack.state, upCard.base_value))
+        if deviation is None:
+            return super().choose_action(stack, possibleActions, upCard)
+        trueCount, action, underAction = deviation
+        return legal_action(ACTION_CODES[action if self.counter.trueCount >= trueCount else underAction],
+                            self.noSplitRows[stack.state][upCard.base_value], possibleActions)
+
+    def choose_actions(self, states: np.ndarray, upValues: np.ndarray) -> np.ndarray:
+        codes = super().choose_actions(states, upValues).copy()
+        trueCount: float = self.counter.trueCount  # Every seat of a table sees the same count
+        for index, key in enumerate(zip(states.tolist(), upValues.tolist())):
+            deviation = self.deviations.get(key)
+            if deviation is not None:
+                codes[index] = ACTION_CODES[deviation[1] if trueCount >= deviation[0] else deviation[2]]
+        return codes
+
+
+class RandomStrategy:
+    """Play a random allowed action, only hit or stand in batch"""
+    def __init__(self, rng: Random | None = None) -> None:
+        self.rng: Random = rng if rng is not None else Random()
+
+    def choose_action(self, stack: Stack, possibleActions: list[PlayerActions], upCard: Card) -> PlayerActions:
+        return self.rng.choice(possibleActions)
+
+    def choose_actions(self, states: np.ndarray, upValues: np.ndarray) -> np.ndarray:
+        return np.array([self.rng.choice((STAND, HIT)) for _ in range(len(states))], dtype=np.uint8)
+
+
+class MimicDealerStrategy:
+    """Play like the dealer: hit under 17"""
+    def choose_action(self, stack: Stack, possibleActions: list[PlayerActions], upCard: Card) -> PlayerActions:
+        return PlayerActions.HIT if stack.dealerHits else PlayerActions.STAND
+
+    def choose_actions(self, states: np.ndarray, upValues: np.ndarray) -> np.ndarray:
+        return np.where(STATE_DEALER_HITS[states], HIT, STAND).astype(np.uint8)